@@ -3,31 +3,7 @@
 提供统一的配置管理接口
 """
 
-from src.config.manager import (
-    ConfigManager,
-    init_config,
-    get_config_manager,
-    get_config,
-    get_dict_config
-)
-
-from src.config.models import (
-    AppConfig,
-    ConfigAccessor,
-    HumanSimulatorConfig,
-    BrowserConfig,
-    JDAccountConfig,
-    SearchConfig,
-    VisionConfig,
-    DatabaseConfig,
-    SchedulerConfig,
-    MonitoringConfig,
-    AntiDetectionConfig,
-    PriceAlertConfig,
-    LoginMethod,
-    DatabaseType,
-    SortMethod
-)
+import importlib
 
 from src.config.exceptions import (
     ConfigError,
@@ -39,32 +15,60 @@ from src.config.exceptions import (
 
 __version__ = "2.0.0"
 
-__all__ = [
+# 管理器和数据模型依赖pydantic等重量级模块，首次访问时才导入
+_LAZY_EXPORTS = {
     # 管理器
-    'ConfigManager',
-    'init_config',
-    'get_config_manager',
-    'get_config',
-    'get_dict_config',
+    'src.config.manager': (
+        'ConfigManager',
+        'init_config',
+        'get_config_manager',
+        'get_config',
+        'get_dict_config',
+    ),
     
-    # 数据模型
-    'AppConfig',
-    'ConfigAccessor',
-    'HumanSimulatorConfig',
-    'BrowserConfig',
-    'JDAccountConfig',
-    'SearchConfig',
-    'VisionConfig',
-    'DatabaseConfig',
-    'SchedulerConfig',
-    'MonitoringConfig',
-    'AntiDetectionConfig',
-    'PriceAlertConfig',
+    # 数据模型和枚举
+    'src.config.models': (
+        'AppConfig',
+        'ConfigAccessor',
+        'HumanSimulatorConfig',
+        'BrowserConfig',
+        'JDAccountConfig',
+        'SearchConfig',
+        'VisionConfig',
+        'DatabaseConfig',
+        'SchedulerConfig',
+        'MonitoringConfig',
+        'AntiDetectionConfig',
+        'PriceAlertConfig',
+        'LoginMethod',
+        'DatabaseType',
+        'SortMethod',
+    ),
+}
+
+# 名称 -> 所在子模块
+_LAZY_ATTRS = {
+    name: module_name
+    for module_name, names in _LAZY_EXPORTS.items()
+    for name in names
+}
+
+def __getattr__(name):
+    """按需导入管理器和数据模型（PEP 562）"""
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
     
-    # 枚举
-    'LoginMethod',
-    'DatabaseType',
-    'SortMethod',
+    value = getattr(importlib.import_module(module_name), name)
+    # 缓存到模块命名空间，后续访问不再经过__getattr__
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+__all__ = [
+    *_LAZY_ATTRS,
     
     # 异常
     'ConfigError',
@@ -3,20 +3,117 @@ loader.py
 配置文件加载器
 """
 
-import yaml
+import os
 import json
-import toml
+import copy
+import contextlib
+import functools
+from enum import Enum
 from pathlib import Path
-from typing import Dict, Any, Optional, Union, List
+from typing import Dict, Any, Optional, Union, List, Tuple, Callable, IO, Iterator
 import logging
 from src.config.exceptions import ConfigFileNotFoundError
 
 logger = logging.getLogger(__name__)
 
+# orjson为可选依赖，可用时加速JSON读写
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# yaml/toml 按需导入，只使用其他格式时不承担导入开销
+_yaml = None
+_yaml_loader = None
+_yaml_dumper = None
+_toml = None
+
+def _represent_config_value(dumper: Any, data: Any) -> Any:
+    """将枚举输出为其值，将SecretStr输出为明文字符串"""
+    if isinstance(data, Enum):
+        return dumper.represent_data(data.value)
+    if hasattr(data, 'get_secret_value'):
+        return dumper.represent_str(data.get_secret_value())
+    return dumper.represent_undefined(data)
+
+def _get_yaml():
+    """首次调用时导入yaml并准备Loader/Dumper"""
+    global _yaml, _yaml_loader, _yaml_dumper
+    
+    if _yaml is None:
+        import yaml
+        
+        # 优先使用libyaml的C实现，不可用时回退到纯Python实现
+        try:
+            from yaml import CSafeLoader as loader, CSafeDumper as dumper
+        except ImportError:
+            from yaml import SafeLoader as loader, SafeDumper as dumper
+        
+        class _ConfigDumper(dumper):
+            """安全的YAML Dumper，额外支持枚举和SecretStr等配置值类型"""
+        
+        _ConfigDumper.add_multi_representer(object, _represent_config_value)
+        
+        _yaml_loader = loader
+        _yaml_dumper = _ConfigDumper
+        _yaml = yaml
+    
+    return _yaml
+
+def _get_toml():
+    """首次调用时导入TOML解析器（3.11+使用标准库tomllib，否则使用tomli）"""
+    global _toml
+    
+    if _toml is None:
+        try:
+            import tomllib as toml
+        except ImportError:
+            import tomli as toml
+        _toml = toml
+    
+    return _toml
+
+# 解析结果缓存: 绝对路径 -> (mtime_ns, size, 配置字典)
+_PARSE_CACHE: Dict[str, Tuple[int, int, Dict[str, Any]]] = {}
+_PARSE_CACHE_MAX_SIZE = 8
+
+def _cached(loader_fn: Callable[[Union[str, Path]], Dict[str, Any]]) -> Callable[[Union[str, Path]], Dict[str, Any]]:
+    """
+    按 (路径, mtime_ns, size) 缓存解析结果，文件变化后自动重新加载
+    
+    命中时返回深拷贝，避免调用方修改缓存内容
+    """
+    @functools.wraps(loader_fn)
+    def wrapper(file_path: Union[str, Path]) -> Dict[str, Any]:
+        path = Path(file_path)
+        try:
+            st = path.stat()
+        except OSError:
+            # 文件不存在等情况交给原加载函数处理（抛出对应异常）
+            return loader_fn(file_path)
+        
+        # abspath为纯字符串运算，不像resolve()那样逐级访问文件系统
+        key = os.path.abspath(path)
+        entry = _PARSE_CACHE.get(key)
+        if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            logger.debug("配置缓存命中: %s", key)
+            return copy.deepcopy(entry[2])
+        
+        data = loader_fn(file_path)
+        # 重新插入到末尾，超出容量时淘汰最早写入的条目
+        _PARSE_CACHE.pop(key, None)
+        _PARSE_CACHE[key] = (st.st_mtime_ns, st.st_size, data)
+        while len(_PARSE_CACHE) > _PARSE_CACHE_MAX_SIZE:
+            del _PARSE_CACHE[next(iter(_PARSE_CACHE))]
+        return copy.deepcopy(data)
+    
+    return wrapper
+
 class ConfigLoader:
     """配置加载器"""
     
     @staticmethod
+    @_cached
     def load_yaml(file_path: Union[str, Path]) -> Dict[str, Any]:
         """
         加载YAML配置文件
@@ -29,15 +126,15 @@ class ConfigLoader:
         """
         path = Path(file_path)
         
-        if not path.exists():
-            raise ConfigFileNotFoundError(f"配置文件不存在: {file_path}")
-        
+        yaml = _get_yaml()
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            # 直接从二进制文件流解析，不先读出完整字符串
+            with path.open('rb') as f:
                 # 安全加载YAML
-                # return yaml.safe_load(content) or {}
-                return yaml.unsafe_load(content) or {}
+                return yaml.load(f, Loader=_yaml_loader) or {}
+        except FileNotFoundError as e:
+            # 直接打开文件，不存在时再转换异常，省去一次额外的stat
+            raise ConfigFileNotFoundError(f"配置文件不存在: {file_path}") from e
         except yaml.YAMLError as e:
             logger.error(f"YAML解析错误: {e}")
             raise
@@ -46,16 +143,18 @@ class ConfigLoader:
             raise
     
     @staticmethod
+    @_cached
     def load_json(file_path: Union[str, Path]) -> Dict[str, Any]:
         """加载JSON配置文件"""
         path = Path(file_path)
         
-        if not path.exists():
-            raise ConfigFileNotFoundError(f"JSON配置文件不存在: {file_path}")
-        
         try:
-            with open(path, 'r', encoding='utf-8') as f:
+            with path.open('rb') as f:
+                if orjson is not None:
+                    return orjson.loads(f.read())
                 return json.load(f)
+        except FileNotFoundError as e:
+            raise ConfigFileNotFoundError(f"JSON配置文件不存在: {file_path}") from e
         except json.JSONDecodeError as e:
             logger.error(f"JSON解析错误: {e}")
             raise
@@ -64,20 +163,33 @@ class ConfigLoader:
             raise
     
     @staticmethod
+    @_cached
     def load_toml(file_path: Union[str, Path]) -> Dict[str, Any]:
         """加载TOML配置文件"""
         path = Path(file_path)
         
-        if not path.exists():
-            raise ConfigFileNotFoundError(f"TOML配置文件不存在: {file_path}")
-        
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                return toml.load(f)
+            with path.open('rb') as f:
+                return _get_toml().load(f)
+        except FileNotFoundError as e:
+            raise ConfigFileNotFoundError(f"TOML配置文件不存在: {file_path}") from e
         except Exception as e:
             logger.error(f"加载TOML配置文件失败: {e}")
             raise
     
+    @staticmethod
+    def invalidate_cache(file_path: Optional[Union[str, Path]] = None) -> None:
+        """
+        清除解析缓存
+        
+        Args:
+            file_path: 配置文件路径，为None则清除全部缓存
+        """
+        if file_path is None:
+            _PARSE_CACHE.clear()
+        else:
+            _PARSE_CACHE.pop(os.path.abspath(file_path), None)
+    
     @staticmethod
     def load_file(file_path: Union[str, Path]) -> Dict[str, Any]:
         """
@@ -102,14 +214,58 @@ class ConfigLoader:
             raise ValueError(f"不支持的配置文件格式: {suffix}")
     
     @staticmethod
-    def save_yaml(data: Dict[str, Any], file_path: Union[str, Path]) -> None:
-        """保存YAML配置文件"""
+    def dump_yaml(data: Dict[str, Any], stream: Optional[IO] = None) -> Optional[str]:
+        """
+        将配置字典序列化为YAML
+        
+        Args:
+            data: 配置字典
+            stream: 输出流，为None时返回YAML文本
+            
+        Returns:
+            stream为None时返回YAML文本，否则返回None
+        """
+        # 保持字典插入顺序，不做逐层排序
+        return _get_yaml().dump(data, stream, Dumper=_yaml_dumper, allow_unicode=True,
+                                default_flow_style=False, sort_keys=False)
+    
+    @staticmethod
+    @contextlib.contextmanager
+    def open_atomic(file_path: Union[str, Path], mode: str = 'wb', **kwargs) -> Iterator[IO]:
+        """
+        原子写入文件：先写同目录临时文件，成功后再os.replace，写入中途失败不会损坏原文件
+        
+        Args:
+            file_path: 目标文件路径
+            mode: 打开模式
+            **kwargs: 传递给open的其他参数
+        """
         path = Path(file_path)
         path.parent.mkdir(parents=True, exist_ok=True)
+        ConfigLoader.invalidate_cache(path)
         
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        try:
+            with open(tmp_path, mode, **kwargs) as f:
+                yield f
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+    
+    @staticmethod
+    def write_atomic(file_path: Union[str, Path], content: bytes) -> None:
+        """原子写入文件内容"""
+        with ConfigLoader.open_atomic(file_path) as f:
+            f.write(content)
+    
+    @staticmethod
+    def save_yaml(data: Dict[str, Any], file_path: Union[str, Path]) -> None:
+        """保存YAML配置文件"""
         try:
-            with open(path, 'w', encoding='utf-8') as f:
-                yaml.dump(data, f, allow_unicode=True, default_flow_style=False)
+            # 直接写入文件流，不构造完整的中间字符串
+            with ConfigLoader.open_atomic(file_path, 'w', encoding='utf-8') as f:
+                ConfigLoader.dump_yaml(data, f)
             logger.debug(f"配置已保存到: {file_path}")
         except Exception as e:
             logger.error(f"保存配置文件失败: {e}")
@@ -120,10 +276,16 @@ class ConfigLoader:
         """保存JSON配置文件"""
         path = Path(file_path)
         path.parent.mkdir(parents=True, exist_ok=True)
+        ConfigLoader.invalidate_cache(path)
         
         try:
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=indent, ensure_ascii=False)
+            # orjson只支持2空格缩进，其他缩进回退到标准库
+            if orjson is not None and indent == 2:
+                with open(path, 'wb') as f:
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            else:
+                with open(path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=indent, ensure_ascii=False)
             logger.debug(f"配置已保存到: {file_path}")
         except Exception as e:
             logger.error(f"保存JSON配置文件失败: {e}")
@@ -141,14 +303,20 @@ class ConfigLoader:
         Returns:
             合并后的配置
         """
-        result = base.copy()
+        result = dict(base)
+        # 显式工作栈代替递归；只复制实际需要合并的嵌套字典，base保持不变
+        stack = [(result, override)]
         
-        for key, value in override.items():
-            if (key in result and isinstance(result[key], dict) and 
-                isinstance(value, dict)):
-                result[key] = ConfigLoader.merge_configs(result[key], value)
-            else:
-                result[key] = value
+        while stack:
+            dst, src = stack.pop()
+            for key, value in src.items():
+                current = dst.get(key)
+                if isinstance(current, dict) and isinstance(value, dict):
+                    current = dict(current)
+                    dst[key] = current
+                    stack.append((current, value))
+                else:
+                    dst[key] = value
         
         return result
     
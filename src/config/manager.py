@@ -3,19 +3,54 @@ manager.py
 配置管理器主类
 """
 
+import copy
+import json
 import logging
+import shutil
+import sys
+import threading
 from pathlib import Path
-from typing import Dict, Any, Optional, Union
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Union, TYPE_CHECKING, get_args
 from datetime import datetime
 
 from src.config.exceptions import ConfigError, ConfigFileNotFoundError, ConfigValidationError
-from src.config.models import AppConfig, ConfigAccessor
 from src.config.loader import ConfigLoader
 from src.config.validator import ConfigValidator
 from src.config.template import ConfigTemplate
 
+if TYPE_CHECKING:
+    from src.config.models import AppConfig, ConfigAccessor
+
 logger = logging.getLogger(__name__)
 
+# orjson为可选依赖，可用时加速JSON快照的序列化
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 敏感字段（点号路径），预先拆分为元组
+SENSITIVE_FIELDS = (
+    'browser.jd_account.password',
+    'database.password',
+    'monitoring.error_notification.telegram_token',
+)
+_SENSITIVE_PATHS = tuple(tuple(field.split('.')) for field in SENSITIVE_FIELDS)
+
+# 数据模型依赖pydantic，首次使用时才导入
+_models = None
+
+def _get_models():
+    """首次调用时导入配置模型模块"""
+    global _models
+    
+    if _models is None:
+        from src.config import models
+        _models = models
+    
+    return _models
+
 class ConfigManager:
     """
     配置管理器
@@ -46,20 +81,35 @@ class ConfigManager:
         self.template_manager = ConfigTemplate(self.template_path.parent)
         
         # 配置数据
-        self._config: Optional[AppConfig] = None
+        self._config: Optional['AppConfig'] = None
         self._dict_config: Dict[str, Any] = {}
-        self._accessor: Optional[ConfigAccessor] = None
+        self._flat_config: Dict[str, Any] = {}
+        self._dict_config_view: Mapping[str, Any] = MappingProxyType(self._dict_config)
+        # 访问器直接引用_dict_config，仅在_dict_config被替换时失效，首次访问时创建
+        self._accessor: Optional['ConfigAccessor'] = None
+        
+        # 模板在进程内不变，首次使用时加载一次
+        self._template_dict: Optional[Dict[str, Any]] = None
+        self._template_shape: Optional[Dict[str, str]] = None
+        
+        # 上次通过验证的配置文件签名 (mtime_ns, size)
+        self._validated_signature: Optional[tuple] = None
+        
+        # 脱敏配置的JSON快照，配置变更时失效，下次读取时重新生成
+        self._safe_json_cache: Optional[bytes] = None
         
         # 加载配置
         self._load_config(auto_create)
         
-        # 创建访问器
-        self._accessor = ConfigAccessor(self._dict_config)
-        
         logger.info(f"配置管理器初始化完成，环境: {self._config.environment}")
     
     def _load_config(self, auto_create: bool) -> None:
-        """加载配置"""
+        """
+        加载配置
+        
+        新配置先加载到局部变量并完成全部验证，成功后才一次性替换当前状态；
+        任一步骤失败时抛出异常，当前配置保持不变
+        """
         # 1. 检查配置文件是否存在
         if not self.config_path.exists():
             if auto_create:
@@ -69,43 +119,133 @@ class ConfigManager:
                     f"配置文件不存在: {self.config_path}"
                 )
         
-        # 2. 加载配置文件
+        # 2. 加载配置文件（先取签名，加载期间文件被修改只会导致下次重新验证）
+        signature = self._get_file_signature()
         try:
-            self._dict_config = self.loader.load_file(self.config_path)
+            dict_config = self.loader.load_file(self.config_path)
         except Exception as e:
             logger.error(f"加载配置文件失败: {e}")
             if auto_create:
                 self._create_config_from_template()
-                self._dict_config = self.loader.load_file(self.config_path)
+                dict_config = self.loader.load_file(self.config_path)
             else:
                 raise
         
-        # 3. 加载模板
-        template_dict = self.template_manager.load_template()
+        # 文件自上次验证通过后未变化时，跳过结构和数据验证
+        if signature is None or signature != self._validated_signature:
+            self._validate_loaded_config(dict_config)
+        else:
+            logger.debug("配置文件未变化，跳过结构和数据验证")
+        
+        # 3. 转换为Pydantic模型
+        try:
+            config = _get_models().AppConfig.model_validate(dict_config)
+        except Exception as e:
+            logger.error(f"配置数据转换失败: {e}")
+            raise ConfigValidationError(f"配置数据格式错误: {e}")
+        
+        flat_config = dict(self._iter_flat_items(dict_config))
         
-        # 4. 验证配置结构
+        # 4. 全部成功后一次性替换：配置字典、模型、点号路径索引和只读视图；
+        #    访问器包装的是旧字典，同时失效
+        self._dict_config = dict_config
+        self._config = config
+        self._flat_config = flat_config
+        self._dict_config_view = MappingProxyType(dict_config)
+        self._accessor = None
+        self._validated_signature = signature
+        self._safe_json_cache = None
+    
+    def _validate_loaded_config(self, config_dict: Dict[str, Any]) -> None:
+        """验证刚加载的配置结构和数据，失败时抛出ConfigValidationError"""
+        # 验证配置结构
         if self.strict_validation:
-            is_valid, errors = self.validator.validate_structure(
-                self._dict_config, template_dict
+            is_valid, errors = self.validator.check_structure(
+                config_dict, self._get_template_shape()
             )
             if not is_valid:
                 error_msg = "配置结构验证失败:\n" + "\n".join(f"  - {error}" for error in errors)
                 logger.error(error_msg)
                 raise ConfigValidationError(error_msg)
         
-        # 5. 验证配置数据
-        is_valid, errors = self.validator.validate_schema(self._dict_config)
+        # 验证配置数据
+        is_valid, errors = self.validator.validate_schema(config_dict)
         if not is_valid:
             error_msg = "配置数据验证失败:\n" + "\n".join(f"  - {error}" for error in errors)
             logger.error(error_msg)
             raise ConfigValidationError(error_msg)
-        
-        # 6. 转换为Pydantic模型
+    
+    def _get_file_signature(self) -> Optional[tuple]:
+        """获取配置文件签名 (mtime_ns, size)，文件不可访问时返回None"""
         try:
-            self._config = AppConfig(**self._dict_config)
-        except Exception as e:
-            logger.error(f"配置数据转换失败: {e}")
-            raise ConfigValidationError(f"配置数据格式错误: {e}")
+            st = self.config_path.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+    
+    def _get_template(self) -> Dict[str, Any]:
+        """获取模板字典（只解析一次）"""
+        if self._template_dict is None:
+            self._template_dict = self.template_manager.load_template()
+        return self._template_dict
+    
+    def _get_template_shape(self) -> Dict[str, str]:
+        """获取模板展开后的 {点号路径: 形状}（只展开一次）"""
+        if self._template_shape is None:
+            self._template_shape = self.validator.flatten_structure(self._get_template())
+        return self._template_shape
+    
+    def _rebuild_flat_index(self) -> None:
+        """
+        将嵌套配置展开为 {点号路径: 值} 索引，供get()单次查找
+        
+        索引包含所有层级的路径（中间字典节点也可直接获取），配置变更后需重建
+        """
+        self._flat_config = dict(self._iter_flat_items(self._dict_config))
+    
+    @staticmethod
+    def _iter_flat_items(data: Dict[str, Any], prefix: str = ""):
+        """遍历嵌套字典，生成 (点号路径, 值)，包括中间字典节点"""
+        stack = [(data, prefix)]
+        
+        while stack:
+            current, prefix = stack.pop()
+            for k, v in current.items():
+                if not isinstance(k, str):
+                    continue
+                # 驻留路径字符串：调用方传入字面量键时，字典查找可直接按身份命中
+                path = sys.intern(prefix + k)
+                yield path, v
+                if isinstance(v, dict):
+                    stack.append((v, path + "."))
+    
+    def _update_flat_index(self, keys: list, old_value: Any) -> None:
+        """
+        set()后增量更新索引，只处理被修改的路径、其父级和新旧子树
+        
+        Args:
+            keys: 已拆分的配置键
+            old_value: 被覆盖的旧值
+        """
+        flat = self._flat_config
+        
+        # 父级可能是新建或被覆盖的字典
+        current = self._dict_config
+        prefix = ""
+        for k in keys[:-1]:
+            current = current[k]
+            flat[prefix + k] = current
+            prefix = prefix + k + "."
+        
+        path = prefix + keys[-1]
+        if isinstance(old_value, dict):
+            for sub_path, _ in self._iter_flat_items(old_value, path + "."):
+                flat.pop(sub_path, None)
+        
+        value = current[keys[-1]]
+        flat[path] = value
+        if isinstance(value, dict):
+            flat.update(self._iter_flat_items(value, path + "."))
     
     def _create_config_from_template(self) -> None:
         """从模板创建配置文件"""
@@ -116,7 +256,7 @@ class ConfigManager:
         
         # 从模板创建配置文件
         success = self.template_manager.create_config_from_template(
-            self.config_path
+            self.config_path, self._get_template()
         )
         
         if not success:
@@ -127,16 +267,25 @@ class ConfigManager:
         print("请编辑配置文件并填写必要信息后再运行程序。")
     
     @property
-    def config(self) -> ConfigAccessor:
+    def config(self) -> 'ConfigAccessor':
         """获取配置访问器（支持点号访问）"""
         if self._accessor is None:
-            self._accessor = ConfigAccessor(self._dict_config)
+            self._accessor = _get_models().ConfigAccessor(self._dict_config)
         return self._accessor
     
     @property
-    def dict_config(self) -> Dict[str, Any]:
-        """获取字典形式的配置"""
-        return self._dict_config.copy()
+    def dict_config(self) -> Mapping[str, Any]:
+        """获取字典形式的配置（只读视图，需要修改时使用dict_config_mutable_copy）"""
+        return self._dict_config_view
+    
+    @property
+    def dict_config_view(self) -> Mapping[str, Any]:
+        """获取配置的只读视图（不复制，随配置变更同步更新）"""
+        return self._dict_config_view
+    
+    def dict_config_mutable_copy(self) -> Dict[str, Any]:
+        """获取配置字典的深拷贝，可自由修改而不影响当前配置"""
+        return copy.deepcopy(self._dict_config)
     
     def get(self, key: str, default: Any = None) -> Any:
         """
@@ -149,16 +298,7 @@ class ConfigManager:
         Returns:
             配置值
         """
-        keys = key.split('.')
-        value = self._dict_config
-        
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                return default
-        
-        return value
+        return self._flat_config.get(key, default)
     
     def set(self, key: str, value: Any, save: bool = False) -> bool:
         """
@@ -186,13 +326,13 @@ class ConfigManager:
                 current = current[k]
             
             # 设置值
+            old_value = current.get(keys[-1])
             current[keys[-1]] = value
+            self._update_flat_index(keys, old_value)
+            self._safe_json_cache = None
             
-            # 更新Pydantic模型
-            self._config = AppConfig(**self._dict_config)
-            
-            # 更新访问器
-            self._accessor = ConfigAccessor(self._dict_config)
+            # 更新Pydantic模型（访问器引用同一字典，无需重建）
+            self._config = self._validate_subtrees(self._dict_config, (keys[0],))
             
             # 保存配置
             if save:
@@ -205,6 +345,46 @@ class ConfigManager:
             logger.error(f"设置配置失败: {e}")
             return False
     
+    def _validate_subtrees(self, config_dict: Dict[str, Any], top_keys) -> 'AppConfig':
+        """
+        只重新验证被修改的顶层子配置，而不是整个AppConfig
+        
+        Args:
+            config_dict: 修改后的配置字典
+            top_keys: 被修改的顶层键
+            
+        Returns:
+            新的AppConfig实例，验证失败时抛出异常且不影响当前配置
+        """
+        from pydantic import BaseModel
+        
+        app_config_cls = _get_models().AppConfig
+        validated = {}
+        
+        for top_key in top_keys:
+            field = app_config_cls.model_fields.get(top_key)
+            if field is None:
+                # 未知顶层字段会被AppConfig忽略，无需验证
+                continue
+            
+            sub_model = field.annotation
+            # Optional[X] 解包为 X
+            if not isinstance(sub_model, type):
+                sub_model = next((arg for arg in get_args(sub_model) if arg is not type(None)), None)
+            
+            if not (isinstance(sub_model, type) and issubclass(sub_model, BaseModel)):
+                # 顶层标量字段没有独立模型，退回完整验证
+                return app_config_cls.model_validate(config_dict)
+            
+            value = config_dict[top_key]
+            if value is None and type(None) in get_args(field.annotation):
+                # 仅Optional字段允许为None，其余交给模型验证并报错
+                validated[top_key] = None
+            else:
+                validated[top_key] = sub_model.model_validate(value)
+        
+        return self._config.model_copy(update=validated) if validated else self._config
+    
     def save(self, backup: bool = True) -> bool:
         """
         保存配置到文件
@@ -216,18 +396,28 @@ class ConfigManager:
             是否成功
         """
         try:
-            # 创建备份
-            if backup and self.config_path.exists():
+            # 转换为字典并序列化
+            config_dict = self._config.model_dump(exclude_unset=True)
+            content = self.loader.dump_yaml(config_dict).encode('utf-8')
+            
+            # 内容与磁盘上的文件一致时不做任何写入
+            try:
+                if self.config_path.read_bytes() == content:
+                    logger.debug(f"配置未变化，跳过保存: {self.config_path}")
+                    return True
+                exists = True
+            except FileNotFoundError:
+                exists = False
+            
+            # 创建备份（复制原文件，原文件保留到新内容原子替换为止）
+            if backup and exists:
                 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
                 backup_file = self.config_path.with_suffix(f".backup.{timestamp}")
-                self.config_path.rename(backup_file)
+                shutil.copy2(self.config_path, backup_file)
                 logger.debug(f"已创建备份: {backup_file}")
             
-            # 转换为字典
-            config_dict = self._config.dict(exclude_unset=True)
-            
             # 保存到文件
-            self.loader.save_yaml(config_dict, self.config_path)
+            self.loader.write_atomic(self.config_path, content)
             
             logger.info(f"配置已保存到: {self.config_path}")
             return True
@@ -245,7 +435,6 @@ class ConfigManager:
         """
         try:
             self._load_config(auto_create=False)
-            self._accessor = ConfigAccessor(self._dict_config)
             logger.info("配置已重新加载")
             return True
         except Exception as e:
@@ -259,11 +448,13 @@ class ConfigManager:
         Returns:
             验证结果字典
         """
-        # 验证结构
-        template_dict = self.template_manager.load_template()
-        struct_valid, struct_errors = self.validator.validate_structure(
-            self._dict_config, template_dict
+        # 验证结构（结构错误和模板差异共用一次遍历）
+        issues = self.validator.diff_structure(
+            self._dict_config, None, include_extra=True,
+            template_shape=self._get_template_shape()
         )
+        struct_errors = self.validator.format_structure_errors(issues)
+        struct_valid = len(struct_errors) == 0
         
         # 验证数据
         data_valid, data_errors = self.validator.validate_schema(self._dict_config)
@@ -272,7 +463,7 @@ class ConfigManager:
         model_errors = []
         try:
             # 尝试重新创建模型来验证
-            AppConfig(**self._dict_config)
+            _get_models().AppConfig.model_validate(self._dict_config)
         except Exception as e:
             model_errors.append(str(e))
         
@@ -281,9 +472,7 @@ class ConfigManager:
             'structure_errors': struct_errors,
             'data_errors': data_errors,
             'model_errors': model_errors,
-            'differences': self.template_manager.compare_with_template(
-                self._dict_config, template_dict
-            )
+            'differences': self.template_manager.summarize_differences(issues)
         }
     
     def get_safe_dict(self, hide_sensitive: bool = True) -> Dict[str, Any]:
@@ -294,26 +483,54 @@ class ConfigManager:
             hide_sensitive: 是否隐藏敏感信息
             
         Returns:
-            安全的配置字典
+            安全的配置字典。隐藏敏感信息时只复制敏感字段所在路径上的字典，
+            其余子字典与当前配置共享，请勿修改
         """
-        config_dict = self._config.dict()
+        if not hide_sensitive:
+            return self.dict_config_mutable_copy()
+        
+        result = dict(self._dict_config)
+        copied = set()
         
-        if hide_sensitive:
-            # 隐藏敏感字段
-            sensitive_fields = []
+        for keys in _SENSITIVE_PATHS:
+            current = result
+            for i, k in enumerate(keys[:-1]):
+                value = current.get(k)
+                if not isinstance(value, dict):
+                    current = None
+                    break
+                # 写时复制：路径上的字典只复制一次
+                if keys[:i + 1] not in copied:
+                    value = dict(value)
+                    current[k] = value
+                    copied.add(keys[:i + 1])
+                current = value
             
-            for field in sensitive_fields:
-                keys = field.split('.')
-                current = config_dict
-                
-                for i, k in enumerate(keys):
-                    if k in current:
-                        if i == len(keys) - 1:
-                            current[k] = "***HIDDEN***"
-                        else:
-                            current = current[k]
-        
-        return config_dict
+            if current is not None and keys[-1] in current:
+                current[keys[-1]] = "***HIDDEN***"
+        
+        return result
+    
+    def get_safe_json(self) -> bytes:
+        """
+        获取脱敏配置的JSON（UTF-8字节）
+        
+        结果在配置变更前被缓存，重复调用不会重新序列化
+        
+        Returns:
+            JSON字节串
+        """
+        if self._safe_json_cache is None:
+            safe_dict = self.get_safe_dict(hide_sensitive=True)
+            if orjson is not None:
+                self._safe_json_cache = orjson.dumps(
+                    safe_dict, default=str, option=orjson.OPT_NON_STR_KEYS
+                )
+            else:
+                self._safe_json_cache = json.dumps(
+                    safe_dict, default=str, ensure_ascii=False
+                ).encode('utf-8')
+        return self._safe_json_cache
     
     def update(self, updates: Dict[str, Any], save: bool = False) -> bool:
         """
@@ -328,13 +545,15 @@ class ConfigManager:
         """
         try:
             # 深度合并配置
-            from .loader import ConfigLoader
             merged_dict = ConfigLoader.merge_configs(self._dict_config, updates)
             
-            # 验证合并后的配置
-            self._config = AppConfig(**merged_dict)
+            # 只验证被更新的顶层子配置
+            self._config = self._validate_subtrees(merged_dict, updates.keys())
             self._dict_config = merged_dict
-            self._accessor = ConfigAccessor(self._dict_config)
+            self._rebuild_flat_index()
+            self._dict_config_view = MappingProxyType(self._dict_config)
+            self._safe_json_cache = None
+            self._accessor = None
             
             if save:
                 self.save()
@@ -353,6 +572,7 @@ class ConfigManager:
 
 # 全局配置管理器实例
 _global_config_manager = None
+_init_lock = threading.Lock()
 
 def init_config(config_file: str = "src/config/config.yaml",
                 template_file: str = "src/config/templates/config.yaml.template",
@@ -370,12 +590,15 @@ def init_config(config_file: str = "src/config/config.yaml",
     """
     global _global_config_manager
     
+    # 双重检查锁定，避免多线程同时构造多个管理器
     if _global_config_manager is None:
-        _global_config_manager = ConfigManager(
-            config_path=config_file,
-            template_path=template_file,
-            auto_create=auto_create
-        )
+        with _init_lock:
+            if _global_config_manager is None:
+                _global_config_manager = ConfigManager(
+                    config_path=config_file,
+                    template_path=template_file,
+                    auto_create=auto_create
+                )
     
     return _global_config_manager
 
@@ -386,27 +609,33 @@ def get_config_manager() -> ConfigManager:
     Returns:
         ConfigManager实例
     """
-    global _global_config_manager
+    manager = _global_config_manager
     
-    if _global_config_manager is None:
+    if manager is None:
         raise ConfigError("配置管理器未初始化，请先调用 init_config()")
     
-    return _global_config_manager
+    return manager
 
-def get_config() -> ConfigAccessor:
+def get_config() -> 'ConfigAccessor':
     """
     获取配置访问器
     
     Returns:
         ConfigAccessor实例
     """
-    return get_config_manager().config
+    manager = _global_config_manager
+    if manager is None:
+        raise ConfigError("配置管理器未初始化，请先调用 init_config()")
+    return manager.config
 
-def get_dict_config() -> Dict[str, Any]:
+def get_dict_config() -> Mapping[str, Any]:
     """
     获取字典形式的配置
     
     Returns:
-        配置字典
+        配置字典的只读视图
     """
-    return get_config_manager().dict_config
+    manager = _global_config_manager
+    if manager is None:
+        raise ConfigError("配置管理器未初始化，请先调用 init_config()")
+    return manager.dict_config
@@ -3,10 +3,11 @@ models.py
 配置数据模型定义（基于Pydantic）
 """
 
-from pydantic import BaseModel, Field, field_validator, SecretStr, ValidationInfo
+from pydantic import BaseModel, ConfigDict, Field, field_validator, SecretStr, ValidationInfo
 from typing import List, Dict, Any, Optional, Tuple
 from enum import Enum
 import os
+from src.config.validator import ConfigValidator
 
 # 枚举类型保持不变...
 class LoginMethod(str, Enum):
@@ -25,8 +26,12 @@ class SortMethod(str, Enum):
     PRICE_DESC = "price_desc"
     SALES = "sales"
 
+# 配置模型基类：加载后只读，修改统一通过ConfigManager.set()/update()进行
+class _ConfigModel(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
 # 嵌套配置模型
-class HumanSimulatorConfig(BaseModel):
+class HumanSimulatorConfig(_ConfigModel):
     """人类行为模拟配置"""
     min_delay: float = Field(0.1, ge=0.01, le=5.0)
     max_delay: float = Field(0.5, ge=0.01, le=5.0)
@@ -57,7 +62,7 @@ class HumanSimulatorConfig(BaseModel):
             raise ValueError('speed_max必须大于speed_min')
         return v
 
-class JDAccountConfig(BaseModel):
+class JDAccountConfig(_ConfigModel):
     """京东账户配置"""
     username: str = ""
     password: SecretStr = SecretStr("")  # 使用SecretStr保护密码
@@ -67,7 +72,7 @@ class JDAccountConfig(BaseModel):
     save_cookies: bool = True
     cookies_expiry_days: int = Field(7, ge=1, le=30)
 
-class NetworkConfig(BaseModel):
+class NetworkConfig(_ConfigModel):
     """网络配置"""
     user_agent: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
     headless: bool = False
@@ -77,11 +82,11 @@ class NetworkConfig(BaseModel):
     
     @field_validator('proxy')
     def validate_proxy(cls, v):
-        if v and not v.startswith(('http://', 'https://', 'socks5://')):
+        if v and not ConfigValidator.validate_url(v):
             raise ValueError('代理格式不正确，应为http://, https://或socks5://开头')
         return v
 
-class BrowserConfig(BaseModel):
+class BrowserConfig(_ConfigModel):
     """浏览器配置"""
     chrome_path: Optional[str] = None
     window_width: int = Field(1366, ge=800, le=4096)
@@ -92,7 +97,7 @@ class BrowserConfig(BaseModel):
 # 其他模型类似地转换为Pydantic BaseModel...
 # 这里只展示关键部分，其他模型转换方式相同
 
-class FilterConditions(BaseModel):
+class FilterConditions(_ConfigModel):
     """筛选条件配置"""
     brands: List[str] = []
     price_range: Tuple[float, float] = (0, 9999)
@@ -100,7 +105,7 @@ class FilterConditions(BaseModel):
     min_rating: float = Field(0.0, ge=0.0, le=5.0)
     min_sales: int = Field(0, ge=0)
 
-class SearchConfig(BaseModel):
+class SearchConfig(_ConfigModel):
     """搜索配置"""
     keywords: List[str] = ["ddr4内存 笔记本电脑组件 32G"]
     max_pages: int = Field(3, ge=1, le=100)
@@ -110,14 +115,14 @@ class SearchConfig(BaseModel):
     filter_conditions: FilterConditions = Field(default_factory=FilterConditions)
     smart_scroll: bool = True
 
-class VisionPreprocessingConfig(BaseModel):
+class VisionPreprocessingConfig(_ConfigModel):
     """视觉预处理配置"""
     denoise: bool = True
     binarization: bool = True
     contrast_enhance: bool = True
     resize_factor: float = Field(2.0, ge=0.5, le=4.0)
 
-class VisionConfig(BaseModel):
+class VisionConfig(_ConfigModel):
     """视觉识别配置"""
     templates_dir: str = "templates"
     match_threshold: float = Field(0.8, ge=0.1, le=1.0)
@@ -126,7 +131,7 @@ class VisionConfig(BaseModel):
     debug_save_images: bool = False
     debug_save_dir: str = "debug_images"
 
-class DatabaseConfig(BaseModel):
+class DatabaseConfig(_ConfigModel):
     """数据库配置"""
     type: DatabaseType = DatabaseType.SQLITE
     path: str = "data/price_data.db"
@@ -140,7 +145,7 @@ class DatabaseConfig(BaseModel):
     backup_dir: str = "backups"
     connection_pool_size: int = Field(5, ge=1, le=50)
 
-class ErrorNotificationConfig(BaseModel):
+class ErrorNotificationConfig(_ConfigModel):
     """错误通知配置"""
     enabled: bool = False
     email: str = ""
@@ -149,7 +154,7 @@ class ErrorNotificationConfig(BaseModel):
     webhook_url: str = ""
     notify_on_errors: List[str] = ["critical", "error"]
 
-class MonitoringConfig(BaseModel):
+class MonitoringConfig(_ConfigModel):
     """监控配置"""
     log_level: str = "INFO"
     log_file: str = "logs/price_tracker.log"
@@ -159,7 +164,7 @@ class MonitoringConfig(BaseModel):
     performance_monitoring: bool = True
     error_notification: ErrorNotificationConfig = Field(default_factory=ErrorNotificationConfig)
 
-class RandomBehaviorConfig(BaseModel):
+class RandomBehaviorConfig(_ConfigModel):
     """随机行为配置"""
     mouse_movement: bool = True
     click_offset: bool = True
@@ -167,14 +172,14 @@ class RandomBehaviorConfig(BaseModel):
     idle_behavior: bool = True
     scroll_variation: bool = True
 
-class IPRotationConfig(BaseModel):
+class IPRotationConfig(_ConfigModel):
     """IP轮换配置"""
     enabled: bool = False
     proxy_list: List[str] = []
     change_interval: int = Field(3600, ge=60, le=86400)
     proxy_type: str = "http"
 
-class AntiDetectionConfig(BaseModel):
+class AntiDetectionConfig(_ConfigModel):
     """反检测配置"""
     rotate_user_agent: bool = True
     user_agents_pool: List[str] = []
@@ -182,7 +187,7 @@ class AntiDetectionConfig(BaseModel):
     ip_rotation: IPRotationConfig = Field(default_factory=IPRotationConfig)
     mimic_human_pattern: bool = True
 
-class PriceAlertConfig(BaseModel):
+class PriceAlertConfig(_ConfigModel):
     """价格提醒配置"""
     enabled: bool = False
     check_interval: int = Field(3600, ge=60, le=86400)
@@ -190,7 +195,7 @@ class PriceAlertConfig(BaseModel):
     rise_threshold: float = Field(0.2, ge=0.0, le=1.0)
     notification_methods: List[str] = ["console"]
 
-class SchedulerConfig(BaseModel):
+class SchedulerConfig(_ConfigModel):
     """定时任务配置"""
     enabled: bool = True
     execution_times: List[str] = ["10:00", "16:00", "22:00"]
@@ -201,14 +206,12 @@ class SchedulerConfig(BaseModel):
     
     @field_validator('execution_times')
     def validate_execution_times(cls, v):
-        import re
-        time_pattern = re.compile(r'^([0-1][0-9]|2[0-3]):([0-5][0-9])$')
         for time_str in v:
-            if not time_pattern.match(time_str):
+            if not ConfigValidator.validate_time(time_str):
                 raise ValueError(f'时间格式无效: {time_str}，应为 HH:MM 格式')
         return v
 
-class AppConfig(BaseModel):
+class AppConfig(_ConfigModel):
     """应用程序主配置"""
     version: str = "1.0.0"
     environment: str = "development"
@@ -224,29 +227,45 @@ class AppConfig(BaseModel):
     anti_detection: AntiDetectionConfig = Field(default_factory=AntiDetectionConfig)
     price_alert: PriceAlertConfig = Field(default_factory=PriceAlertConfig)
     
-    class Config:
+    model_config = ConfigDict(
         # 允许任意字段，但会验证已知字段
-        extra = "ignore"
+        extra="ignore",
         
         # 自定义JSON编码
-        json_encoders = {
+        json_encoders={
             SecretStr: lambda v: v.get_secret_value() if v else None
-        }
+        },
+    )
 
 # 辅助类，用于简化嵌套访问
 class ConfigAccessor:
     """配置访问器，支持点号访问"""
     
+    __slots__ = ('_config', '_children')
+    
     def __init__(self, config_dict):
         self._config = config_dict
+        # 子访问器缓存：键 -> 包装同一子字典的ConfigAccessor
+        self._children = {}
     
     def __getattr__(self, name):
-        if name in self._config:
+        # 槽位未初始化时（如copy/pickle创建的实例）不查找配置，避免无限递归
+        if name in ConfigAccessor.__slots__:
+            raise AttributeError(name)
+        
+        try:
             value = self._config[name]
-            if isinstance(value, dict):
-                return ConfigAccessor(value)
-            return value
-        raise AttributeError(f"配置中没有属性 '{name}'")
+        except KeyError:
+            raise AttributeError(f"配置中没有属性 '{name}'") from None
+        
+        if isinstance(value, dict):
+            # 访问器引用活动字典而非快照；子字典被替换后重新包装
+            child = self._children.get(name)
+            if child is None or child._config is not value:
+                child = ConfigAccessor(value)
+                self._children[name] = child
+            return child
+        return value
     
     def __repr__(self):
         return f"ConfigAccessor({self._config})"
\ No newline at end of file
@@ -3,14 +3,19 @@ template.py
 配置模板管理
 """
 
-import yaml
+import os
 from pathlib import Path
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, Optional, Union, List, Tuple
 import logging
-from src.config.models import AppConfig
+from src.config.exceptions import ConfigFileNotFoundError
+from src.config.loader import ConfigLoader
+from src.config.validator import ConfigValidator
 
 logger = logging.getLogger(__name__)
 
+# 随源码发布的默认模板，模板目录中缺少模板时直接复制，无需构造模型再序列化
+_BUNDLED_TEMPLATE = Path(__file__).parent / "templates" / "config.yaml.template"
+
 class ConfigTemplate:
     """配置模板管理器"""
     
@@ -25,33 +30,41 @@ class ConfigTemplate:
         Returns:
             模板配置字典
         """
-        if not self.template_file.exists():
-            return self._create_default_template()
-        
+        # load_yaml按 (路径, mtime_ns, size) 缓存解析结果，模板未变化时不会重复解析；
+        # 直接加载而不预先exists()，省去一次额外的stat
         try:
-            with open(self.template_file, 'r', encoding='utf-8') as f:
-                # return yaml.unsafe_load(f) or {}
-                return yaml.unsafe_load(f) or {}
+            return ConfigLoader.load_yaml(self.template_file)
+        except ConfigFileNotFoundError:
+            return self._create_default_template()
         except Exception as e:
             logger.error(f"加载配置模板失败: {e}")
             return self._create_default_template()
     
     def _create_default_template(self) -> Dict[str, Any]:
         """创建默认配置模板"""
+        # 优先复制随源码发布的模板（模板文件本身损坏时除外）
+        if (_BUNDLED_TEMPLATE.is_file() and
+                os.path.abspath(_BUNDLED_TEMPLATE) != os.path.abspath(self.template_file)):
+            try:
+                ConfigLoader.write_atomic(self.template_file, _BUNDLED_TEMPLATE.read_bytes())
+                logger.info(f"已复制默认配置模板: {self.template_file}")
+                return ConfigLoader.load_yaml(self.template_file)
+            except Exception as e:
+                logger.warning(f"复制默认配置模板失败，改为从模型生成: {e}")
+        
+        # 仅在没有可用模板时才需要模型，避免模块导入时加载pydantic
+        from src.config.models import AppConfig
+        
         default_config = AppConfig()
-        template_dict = default_config.dict(exclude_unset=True)
+        template_dict = default_config.model_dump(exclude_unset=True)
         
         # 清理敏感信息
         template_dict['browser']['jd_account']['password'] = ""
         template_dict['database']['password'] = ""
         template_dict['monitoring']['error_notification']['telegram_token'] = ""
         
-        # 确保模板目录存在
-        self.template_dir.mkdir(parents=True, exist_ok=True)
-        
-        # 保存模板
-        with open(self.template_file, 'w', encoding='utf-8') as f:
-            yaml.dump(template_dict, f, allow_unicode=True, default_flow_style=False)
+        # 保存模板（save_yaml会确保模板目录存在）
+        ConfigLoader.save_yaml(template_dict, self.template_file)
         
         logger.info(f"已创建默认配置模板: {self.template_file}")
         return template_dict
@@ -74,10 +87,7 @@ class ConfigTemplate:
                 template_dict = self.load_template()
             
             output_path = Path(output_path)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                yaml.dump(template_dict, f, allow_unicode=True, default_flow_style=False)
+            ConfigLoader.save_yaml(template_dict, output_path)
             
             logger.info(f"已从模板创建配置文件: {output_path}")
             return True
@@ -101,36 +111,33 @@ class ConfigTemplate:
         if template_dict is None:
             template_dict = self.load_template()
         
+        return self.summarize_differences(
+            ConfigValidator.diff_structure(config_dict, template_dict, include_extra=True)
+        )
+    
+    @staticmethod
+    def summarize_differences(issues: List[Tuple[str, str, str]]) -> Dict[str, Any]:
+        """
+        将ConfigValidator.diff_structure的结果整理为差异信息字典
+        
+        Args:
+            issues: 结构差异列表
+            
+        Returns:
+            差异信息字典
+        """
         differences = {
             'missing_fields': [],
             'extra_fields': [],
             'type_mismatches': []
         }
         
-        def _compare(config: Dict, template: Dict, path: str = ""):
-            for key, template_value in template.items():
-                current_path = f"{path}.{key}" if path else key
-                
-                if key not in config:
-                    differences['missing_fields'].append(current_path)
-                    continue
-                
-                config_value = config[key]
-                
-                if isinstance(template_value, dict):
-                    if not isinstance(config_value, dict):
-                        differences['type_mismatches'].append(f"{current_path}: 应为字典")
-                    else:
-                        _compare(config_value, template_value, current_path)
-                elif isinstance(template_value, list):
-                    if not isinstance(config_value, list):
-                        differences['type_mismatches'].append(f"{current_path}: 应为列表")
-            
-            # 检查额外字段
-            for key in config:
-                if key not in template:
-                    current_path = f"{path}.{key}" if path else key
-                    differences['extra_fields'].append(current_path)
+        for kind, path, expected in issues:
+            if kind == 'missing':
+                differences['missing_fields'].append(path)
+            elif kind == 'extra':
+                differences['extra_fields'].append(path)
+            else:
+                differences['type_mismatches'].append(f"{path}: 应为{expected}")
         
-        _compare(config_dict, template_dict)
         return differences
\ No newline at end of file
@@ -3,80 +3,225 @@ validator.py
 配置验证器
 """
 
-import re
-from typing import Dict, Any, List, Tuple
-from urllib.parse import urlparse
+from typing import Dict, Any, List, Optional, Tuple
 import logging
 from src.config.exceptions import ConfigValidationError
 
 logger = logging.getLogger(__name__)
 
+# 有效的日志级别
+_LOG_LEVELS = frozenset({'DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'})
+
+# 邮箱域名与本地部分允许的字符（ASCII字母、数字及少量符号）
+_EMAIL_DOMAIN_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789.-')
+_EMAIL_LOCAL_CHARS = _EMAIL_DOMAIN_CHARS | frozenset('_%+')
+
+# 代理地址允许的协议
+PROXY_SCHEMES = ('http', 'https', 'socks5')
+
 class ConfigValidator:
     """配置验证器"""
     
+    @staticmethod
+    def diff_structure(config_dict: Dict[str, Any],
+                       template_dict: Optional[Dict[str, Any]],
+                       include_extra: bool = False,
+                       template_shape: Optional[Dict[str, str]] = None,
+                       max_issues: Optional[int] = None) -> List[Tuple[str, str, str]]:
+        """
+        比较配置与模板的结构差异
+        
+        两侧都先展开为 {点号路径: 形状}，再按路径查找比较，不做递归遍历
+        
+        Args:
+            config_dict: 待比较的配置字典
+            template_dict: 模板配置字典，提供template_shape时可为None
+            include_extra: 是否同时收集模板中不存在的额外字段
+            template_shape: 预先展开的模板（flatten_structure的结果），为None时由template_dict展开
+            max_issues: 收集到的差异达到该数量时立即返回，为None则不限制
+            
+        Returns:
+            差异列表，每项为 (类型, 路径, 期望类型)，类型为 'missing' / 'type' / 'extra'，
+            期望类型仅对 'type' 有效（"字典"或"列表"）。缺失和类型不符按模板顺序在前，额外字段按配置顺序在后
+        """
+        if template_shape is None:
+            template_shape = ConfigValidator.flatten_structure(template_dict)
+        config_shape = ConfigValidator.flatten_structure(config_dict)
+        
+        issues = []
+        # 缺失或类型不符的路径，其下级路径不再重复报告
+        failed = set()
+        
+        for path, expected in template_shape.items():
+            if path.rpartition('.')[0] in failed:
+                failed.add(path)
+                continue
+            
+            actual = config_shape.get(path)
+            if actual is None:
+                issues.append(('missing', path, ''))
+                failed.add(path)
+            elif expected and actual != expected:
+                issues.append(('type', path, '字典' if expected == 'dict' else '列表'))
+                failed.add(path)
+            else:
+                continue
+            
+            if max_issues is not None and len(issues) >= max_issues:
+                return issues
+        
+        if include_extra:
+            for path in config_shape:
+                if path in template_shape:
+                    continue
+                # 只报告模板中字典节点下的额外字段，模板标量节点下的子键不逐一报告
+                parent = path.rpartition('.')[0]
+                if not parent or template_shape.get(parent) == 'dict':
+                    issues.append(('extra', path, ''))
+                    if max_issues is not None and len(issues) >= max_issues:
+                        break
+        
+        return issues
+    
+    @staticmethod
+    def format_structure_errors(issues: List[Tuple[str, str, str]]) -> List[str]:
+        """将diff_structure的结果转换为结构错误信息（忽略额外字段）"""
+        errors = []
+        for kind, path, expected in issues:
+            if kind == 'missing':
+                errors.append(f"缺少必需字段: {path}")
+            elif kind == 'type':
+                errors.append(f"字段类型不匹配: {path} 应为{expected}")
+        return errors
+    
+    @staticmethod
+    def flatten_structure(data: Dict[str, Any]) -> Dict[str, str]:
+        """
+        将嵌套字典展开为 {点号路径: 形状}，形状为 'dict' / 'list' / ''
+        
+        结果按模板遍历顺序排列，模板的展开结果可缓存后反复用于check_structure
+        """
+        shape = {}
+        # 栈中保存各层的迭代器，保持与递归遍历一致的先序顺序
+        stack = [(iter(data.items()), "")]
+        
+        while stack:
+            items, prefix = stack[-1]
+            for key, value in items:
+                path = f"{prefix}{key}"
+                if isinstance(value, dict):
+                    shape[path] = 'dict'
+                    stack.append((iter(value.items()), f"{path}."))
+                    break
+                shape[path] = 'list' if isinstance(value, list) else ''
+            else:
+                stack.pop()
+        
+        return shape
+    
+    @staticmethod
+    def check_structure(config_dict: Dict[str, Any],
+                        template_shape: Dict[str, str],
+                        max_errors: Optional[int] = None) -> Tuple[bool, List[str]]:
+        """
+        用预先展开的模板路径验证配置结构
+        
+        Args:
+            config_dict: 待验证的配置字典
+            template_shape: flatten_structure(模板字典) 的结果
+            max_errors: 最多收集的错误数，达到后立即返回；只需判断是否通过时可传1
+            
+        Returns:
+            (是否一致, 错误信息列表)
+        """
+        errors = ConfigValidator.format_structure_errors(
+            ConfigValidator.diff_structure(config_dict, None, template_shape=template_shape,
+                                           max_issues=max_errors)
+        )
+        return len(errors) == 0, errors
+    
     @staticmethod
     def validate_structure(config_dict: Dict[str, Any], 
-                          template_dict: Dict[str, Any]) -> Tuple[bool, List[str]]:
+                          template_dict: Dict[str, Any],
+                          max_errors: Optional[int] = None) -> Tuple[bool, List[str]]:
         """
         验证配置结构与模板是否一致
         
         Args:
             config_dict: 待验证的配置字典
             template_dict: 模板配置字典
+            max_errors: 最多收集的错误数，为None则收集全部
             
         Returns:
             (是否一致, 错误信息列表)
         """
-        errors = []
-        
-        def _compare_dicts(config: Dict, template: Dict, path: str = ""):
-            for key, template_value in template.items():
-                current_path = f"{path}.{key}" if path else key
-                
-                if key not in config:
-                    errors.append(f"缺少必需字段: {current_path}")
-                    continue
-                
-                config_value = config[key]
-                
-                if isinstance(template_value, dict):
-                    if not isinstance(config_value, dict):
-                        errors.append(f"字段类型不匹配: {current_path} 应为字典")
-                    else:
-                        _compare_dicts(config_value, template_value, current_path)
-                elif isinstance(template_value, list):
-                    if not isinstance(config_value, list):
-                        errors.append(f"字段类型不匹配: {current_path} 应为列表")
-        
-        _compare_dicts(config_dict, template_dict)
-        return len(errors) == 0, errors
+        return ConfigValidator.check_structure(
+            config_dict, ConfigValidator.flatten_structure(template_dict), max_errors
+        )
     
     @staticmethod
-    def validate_url(url: str) -> bool:
-        """验证URL格式"""
-        try:
-            result = urlparse(url)
-            return all([result.scheme, result.netloc])
-        except:
+    def validate_url(url: str, schemes: Tuple[str, ...] = PROXY_SCHEMES) -> bool:
+        """
+        验证URL格式：协议在允许列表中且主机部分非空
+        
+        只做前缀和分隔符检查，不构造完整的urlparse结果
+        """
+        if not isinstance(url, str):
             return False
+        scheme, sep, rest = url.partition('://')
+        return bool(sep) and scheme.lower() in schemes and rest[:1] not in ('', '/', '?', '#')
+    
+    @staticmethod
+    def parse_time(time_str: str) -> Optional[int]:
+        """
+        解析 HH:MM 格式的时间
+        
+        Returns:
+            自零点起的分钟数，格式无效时返回None
+        """
+        if (not isinstance(time_str, str) or len(time_str) != 5 or time_str[2] != ':'
+                or not time_str.isascii()):
+            return None
+        hh, mm = time_str[:2], time_str[3:]
+        if not (hh.isdigit() and mm.isdigit()):
+            return None
+        hour, minute = int(hh), int(mm)
+        if hour > 23 or minute > 59:
+            return None
+        return hour * 60 + minute
     
     @staticmethod
     def validate_time(time_str: str) -> bool:
         """验证时间格式 (HH:MM)"""
-        pattern = r'^([0-1][0-9]|2[0-3]):([0-5][0-9])$'
-        return bool(re.match(pattern, time_str))
+        return ConfigValidator.parse_time(time_str) is not None
     
     @staticmethod
     def validate_email(email: str) -> bool:
-        """验证邮箱格式"""
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(pattern, email))
+        """
+        验证邮箱格式
+        
+        等价于正则 ^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$，
+        但用字符集合检查代替正则匹配
+        """
+        if not isinstance(email, str):
+            return False
+        local, sep, domain = email.partition('@')
+        host, _, tld = domain.rpartition('.')
+        return (bool(sep) and bool(local) and bool(host)
+                and len(tld) >= 2 and tld.isascii() and tld.isalpha()
+                and _EMAIL_LOCAL_CHARS.issuperset(local)
+                and _EMAIL_DOMAIN_CHARS.issuperset(domain))
     
     @staticmethod
     def validate_log_level(level: str) -> bool:
         """验证日志级别"""
-        valid_levels = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
-        return level.upper() in valid_levels
+        return isinstance(level, str) and level.upper() in _LOG_LEVELS
+    
+    @staticmethod
+    def _get_section(config: Dict[str, Any], key: str) -> Dict[str, Any]:
+        """获取子配置字典；不是字典时返回空字典，依赖它的检查随之跳过（结构错误由结构验证报告）"""
+        value = config.get(key)
+        return value if isinstance(value, dict) else {}
     
     @staticmethod
     def validate_schema(config_dict: Dict[str, Any]) -> Tuple[bool, List[str]]:
@@ -90,9 +235,10 @@ class ConfigValidator:
             (是否有效, 错误列表)
         """
         errors = []
+        section = ConfigValidator._get_section
         
         # 验证数据库配置
-        db_config = config_dict.get('database', {})
+        db_config = section(config_dict, 'database')
         if db_config.get('type') != 'sqlite':
             if not db_config.get('host'):
                 errors.append("数据库主机地址未设置")
@@ -100,24 +246,25 @@ class ConfigValidator:
                 errors.append("数据库名称未设置")
         
         # 验证时间格式
-        scheduler_config = config_dict.get('scheduler', {})
-        for time_str in scheduler_config.get('execution_times', []):
+        execution_times = section(config_dict, 'scheduler').get('execution_times')
+        for time_str in execution_times if isinstance(execution_times, list) else ():
             if not ConfigValidator.validate_time(time_str):
                 errors.append(f"时间格式无效: {time_str}，应为 HH:MM 格式")
         
         # 验证代理URL
-        proxy = config_dict.get('browser', {}).get('network', {}).get('proxy')
-        if proxy and not ConfigValidator.validate_url(proxy):
+        proxy = section(section(config_dict, 'browser'), 'network').get('proxy')
+        if isinstance(proxy, str) and proxy and not ConfigValidator.validate_url(proxy):
             errors.append(f"代理URL格式无效: {proxy}")
         
-        # 验证邮箱
-        email = config_dict.get('monitoring', {}).get('error_notification', {}).get('email')
-        if email and not ConfigValidator.validate_email(email):
+        # 验证邮箱（监控配置只查找一次，邮箱和日志级别共用）
+        monitoring_config = section(config_dict, 'monitoring')
+        email = section(monitoring_config, 'error_notification').get('email')
+        if isinstance(email, str) and email and not ConfigValidator.validate_email(email):
             errors.append(f"邮箱格式无效: {email}")
         
         # 验证日志级别
-        log_level = config_dict.get('monitoring', {}).get('log_level')
-        if log_level and not ConfigValidator.validate_log_level(log_level):
+        log_level = monitoring_config.get('log_level')
+        if isinstance(log_level, str) and log_level and not ConfigValidator.validate_log_level(log_level):
             errors.append(f"日志级别无效: {log_level}")
         
         return len(errors) == 0, errors
\ No newline at end of file
@@ -1,25 +1,81 @@
 import sqlite3
 import json
 import os
-from typing import List, Dict, Any, Optional
+import threading
+import weakref
+from typing import List, Dict, Any, Optional, Set, Tuple
 from datetime import datetime
 
+# orjson为可选依赖，可用时加速JSON导入
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 价格字符串中需要去除的货币符号和千位分隔符，str.translate一次完成
+_PRICE_STRIP_TABLE = str.maketrans('', '', '¥$,')
+
+# 导出用的JSON编码器，复用同一实例避免每条记录重新构造；
+# 导出不使用orjson：它的浮点数格式（如1e16、1e-5）与标准库（1e+16、1e-05）不同
+_EXPORT_ENCODER = json.JSONEncoder(ensure_ascii=False, indent=2)
+
+class _Connection(sqlite3.Connection):
+    """支持弱引用的连接：线程结束后随线程局部存储一起释放并关闭"""
+
 class ProductDatabase:
     def __init__(self, db_name: str = "products.db"):
         """初始化数据库连接"""
         self.db_name = db_name
-        self.conn = None
-        self.cursor = None
+        
+        # 每个线程使用各自的连接，WAL模式下多个读线程可以并发查询；
+        # 内存数据库每个连接都是独立的库，只能共享同一个连接
+        self._shared = db_name in (':memory:', '')
+        self._local = threading.local()
+        self._connections: 'weakref.WeakSet[sqlite3.Connection]' = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._main_conn: Optional[sqlite3.Connection] = None
+        
+        # 已确认存在于categories表中的分类名，插入时跳过这些分类
+        self._known_categories: Set[str] = set()
+        
         self._initialize_database()
     
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """当前线程的数据库连接，首次访问时创建"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._main_conn if self._shared else self._connect()
+            self._local.conn = conn
+        return conn
+    
+    def _connect(self) -> sqlite3.Connection:
+        """创建并登记一个新连接"""
+        conn = sqlite3.connect(self.db_name, check_same_thread=False, factory=_Connection)
+        # 行对象在C层按列名映射，转换为字典时无需逐行zip列名
+        conn.row_factory = sqlite3.Row
+        
+        # WAL中NORMAL同步已足够安全；临时表放在内存中，并用mmap读取数据库文件
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
+        
+        with self._lock:
+            self._connections.add(conn)
+        return conn
+    
     def _initialize_database(self):
         """初始化数据库和表结构"""
         try:
-            self.conn = sqlite3.connect(self.db_name, check_same_thread=False)
-            self.cursor = self.conn.cursor()
+            self._main_conn = self._connect()
+            self._local.conn = self._main_conn
+            cursor = self._main_conn.cursor()
+            
+            # WAL模式会持久保存在数据库文件中，Web端的读取不会被写入阻塞
+            cursor.execute("PRAGMA journal_mode=WAL")
             
             # 创建商品表
-            self.cursor.execute('''
+            cursor.execute('''
                 CREATE TABLE IF NOT EXISTS products (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     name TEXT NOT NULL,
@@ -34,7 +90,7 @@ class ProductDatabase:
             ''')
             
             # 创建分类表（可选，用于规范化）
-            self.cursor.execute('''
+            cursor.execute('''
                 CREATE TABLE IF NOT EXISTS categories (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     name TEXT UNIQUE NOT NULL,
@@ -43,7 +99,7 @@ class ProductDatabase:
             ''')
             
             # 创建价格历史表（记录价格变动）
-            self.cursor.execute('''
+            cursor.execute('''
                 CREATE TABLE IF NOT EXISTS price_history (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     product_id INTEGER,
@@ -53,7 +109,22 @@ class ProductDatabase:
                 )
             ''')
             
+            # 索引：按创建时间排序的搜索、分类筛选和价格历史查询
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_products_created ON products (created_at DESC)"
+            )
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_products_category ON products (category)"
+            )
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_price_history_product "
+                "ON price_history (product_id, recorded_at DESC)"
+            )
+            
             self.conn.commit()
+            self._known_categories.update(
+                row[0] for row in cursor.execute("SELECT name FROM categories")
+            )
             print(f"数据库 '{self.db_name}' 初始化成功！")
             
         except sqlite3.Error as e:
@@ -63,28 +134,34 @@ class ProductDatabase:
     def insert_product(self, name: str, category: str, price: float, 
                       source_url: Optional[str] = None) -> int:
         """插入单个商品"""
+        conn = self.conn
+        cursor = conn.cursor()
         try:
             # 先插入或获取分类
-            self.cursor.execute(
-                "INSERT OR IGNORE INTO categories (name) VALUES (?)",
-                (category,)
-            )
+            new_category = category not in self._known_categories
+            if new_category:
+                cursor.execute(
+                    "INSERT OR IGNORE INTO categories (name) VALUES (?)",
+                    (category,)
+                )
             
             # 插入商品
-            self.cursor.execute('''
+            cursor.execute('''
                 INSERT INTO products (name, category, price, source_url, updated_at)
                 VALUES (?, ?, ?, ?, ?)
             ''', (name, category, price, source_url, datetime.now()))
             
-            product_id = self.cursor.lastrowid
+            product_id = cursor.lastrowid
             
             # 记录价格历史
-            self.cursor.execute('''
+            cursor.execute('''
                 INSERT INTO price_history (product_id, price)
                 VALUES (?, ?)
             ''', (product_id, price))
             
-            self.conn.commit()
+            conn.commit()
+            if new_category:
+                self._known_categories.add(category)
             return product_id
             
         except sqlite3.Error as e:
@@ -92,8 +169,8 @@ class ProductDatabase:
             return -1
     
     def insert_from_json(self, json_data: List[Dict[str, Any]]):
-        """从JSON数据批量插入商品"""
-        success_count = 0
+        """从JSON数据批量插入商品（单个事务，只提交一次）"""
+        rows = []
         for item in json_data:
             try:
                 name = item.get('name', '').strip()
@@ -108,16 +185,61 @@ class ProductDatabase:
                 # 尝试转换价格为浮点数
                 try:
                     if isinstance(price, str):
-                        price = float(price.replace('¥', '').replace('$', '').replace(',', ''))
+                        price = float(price.translate(_PRICE_STRIP_TABLE))
                 except:
                     price = 0
                 
-                self.insert_product(name, category, price, item.get('source_url'))
-                success_count += 1
+                rows.append((name, category, price, item.get('source_url')))
                 
             except Exception as e:
                 print(f"处理商品失败 {item}: {e}")
         
+        success_count = 0
+        if rows:
+            now = datetime.now()
+            conn = self.conn
+            cursor = conn.cursor()
+            try:
+                # 分类去重后一次性插入，已知存在的分类直接跳过
+                known = self._known_categories
+                new_categories = [
+                    category for category in dict.fromkeys(row[1] for row in rows)
+                    if category not in known
+                ]
+                if new_categories:
+                    cursor.executemany(
+                        "INSERT OR IGNORE INTO categories (name) VALUES (?)",
+                        [(category,) for category in new_categories]
+                    )
+                
+                # 商品逐条插入以取得各自的id，但都在同一事务中
+                history = []
+                for name, category, price, source_url in rows:
+                    try:
+                        cursor.execute('''
+                            INSERT INTO products (name, category, price, source_url, updated_at)
+                            VALUES (?, ?, ?, ?, ?)
+                        ''', (name, category, price, source_url, now))
+                    except sqlite3.Error as e:
+                        # 单条语句失败只回滚该语句，事务中的其他商品不受影响
+                        print(f"插入商品失败 {name}: {e}")
+                        continue
+                    history.append((cursor.lastrowid, price))
+                
+                # 批量记录价格历史
+                cursor.executemany('''
+                    INSERT INTO price_history (product_id, price)
+                    VALUES (?, ?)
+                ''', history)
+                
+                conn.commit()
+                known.update(new_categories)
+                success_count = len(history)
+                
+            except sqlite3.Error as e:
+                conn.rollback()
+                print(f"批量插入失败，已回滚: {e}")
+        
         print(f"批量插入完成，成功插入 {success_count} 条记录")
     
     def import_json_file(self, filepath: str):
@@ -127,8 +249,9 @@ class ProductDatabase:
             return
         
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(filepath, 'rb') as f:
+                raw = f.read()
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
             
             if isinstance(data, dict):
                 data = [data]  # 如果是单个对象，转换为列表
@@ -139,6 +262,7 @@ class ProductDatabase:
             self.insert_from_json(data)
             
         except json.JSONDecodeError:
+            # orjson.JSONDecodeError是json.JSONDecodeError的子类
             print(f"JSON文件格式错误: {filepath}")
         except Exception as e:
             print(f"导入文件失败: {e}")
@@ -172,23 +296,47 @@ class ProductDatabase:
         query += " ORDER BY created_at DESC LIMIT ?"
         params.append(limit)
         
-        self.cursor.execute(query, params)
-        columns = [desc[0] for desc in self.cursor.description]
-        
-        results = []
-        for row in self.cursor.fetchall():
-            results.append(dict(zip(columns, row)))
-        
-        return results
+        return [dict(row) for row in self.conn.execute(query, params).fetchall()]
     
     def get_categories(self) -> List[str]:
         """获取所有分类"""
-        self.cursor.execute("SELECT DISTINCT name FROM categories ORDER BY name")
-        return [row[0] for row in self.cursor.fetchall()]
+        cursor = self.conn.execute("SELECT DISTINCT name FROM categories ORDER BY name")
+        return [row[0] for row in cursor.fetchall()]
+    
+    def get_category_counts(self, limit: int = 1000) -> List[Tuple[str, int]]:
+        """统计最近limit个商品的分类分布，按数量降序"""
+        cursor = self.conn.execute('''
+            SELECT category, COUNT(*) AS count
+            FROM (SELECT category FROM products ORDER BY created_at DESC LIMIT ?)
+            WHERE category IS NOT NULL
+            GROUP BY category
+            ORDER BY count DESC
+        ''', (limit,))
+        return [(row[0], row[1]) for row in cursor.fetchall()]
+    
+    def get_recent_prices(self, limit: int = 1000) -> List[float]:
+        """获取最近limit个商品的价格"""
+        cursor = self.conn.execute(
+            "SELECT price FROM products ORDER BY created_at DESC LIMIT ?", (limit,)
+        )
+        return [row[0] for row in cursor.fetchall()]
+    
+    def get_data_version(self) -> Tuple[int, int]:
+        """
+        获取数据版本，任何连接提交写入后都会变化，可作为查询结果缓存的键
+        
+        始终在主连接上读取，不同线程得到的版本可以互相比较
+        
+        Returns:
+            (主连接的累计修改行数, 其他连接提交计数PRAGMA data_version)
+        """
+        with self._lock:
+            data_version = self._main_conn.execute("PRAGMA data_version").fetchone()[0]
+            return self._main_conn.total_changes, data_version
     
     def get_price_history(self, product_id: int) -> List[Dict[str, Any]]:
         """获取商品价格历史"""
-        self.cursor.execute('''
+        cursor = self.conn.execute('''
             SELECT price, recorded_at 
             FROM price_history 
             WHERE product_id = ? 
@@ -197,41 +345,56 @@ class ProductDatabase:
         
         return [
             {"price": row[0], "recorded_at": row[1]}
-            for row in self.cursor.fetchall()
+            for row in cursor.fetchall()
         ]
     
-    def export_to_json(self, filepath: str = "products_export.json"):
-        """导出数据到JSON文件"""
-        products = self.search_products(limit=10000)
+    def export_to_json(self, filepath: str = "products_export.json", limit: int = 10000):
+        """
+        导出数据到JSON文件
+        
+        按批从游标读取并逐条写入，不在内存中构造完整的商品列表；
+        输出格式与 json.dump(商品列表, ensure_ascii=False, indent=2) 一致
+        """
+        cursor = self.conn.execute(
+            "SELECT * FROM products ORDER BY created_at DESC LIMIT ?", (limit,)
+        )
+        count = 0
         
         with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(products, f, ensure_ascii=False, indent=2)
+            while True:
+                rows = cursor.fetchmany(1000)
+                if not rows:
+                    break
+                for row in rows:
+                    item = _EXPORT_ENCODER.encode(dict(row))
+                    f.write('[\n  ' if count == 0 else ',\n  ')
+                    f.write(item.replace('\n', '\n  '))
+                    count += 1
+            f.write('\n]' if count else '[]')
         
-        print(f"数据已导出到 {filepath}，共 {len(products)} 条记录")
+        print(f"数据已导出到 {filepath}，共 {count} 条记录")
     
     def get_statistics(self) -> Dict[str, Any]:
         """获取统计信息"""
-        stats = {}
+        # 一次扫描同时得到商品数、分类数以及有效价格（>0）的平均值和范围
+        total_products, total_categories, avg_price, min_price, max_price = self.conn.execute(
+            """
+            SELECT COUNT(*),
+                   COUNT(DISTINCT category),
+                   AVG(CASE WHEN price > 0 THEN price END),
+                   MIN(CASE WHEN price > 0 THEN price END),
+                   MAX(CASE WHEN price > 0 THEN price END)
+            FROM products
+            """
+        ).fetchone()
         
-        # 总商品数
-        self.cursor.execute("SELECT COUNT(*) FROM products")
-        stats['total_products'] = self.cursor.fetchone()[0]
-        
-        # 分类数量
-        self.cursor.execute("SELECT COUNT(DISTINCT category) FROM products")
-        stats['total_categories'] = self.cursor.fetchone()[0]
-        
-        # 平均价格
-        self.cursor.execute("SELECT AVG(price) FROM products WHERE price > 0")
-        stats['avg_price'] = self.cursor.fetchone()[0] or 0
-        
-        # 价格范围
-        self.cursor.execute("SELECT MIN(price), MAX(price) FROM products WHERE price > 0")
-        min_price, max_price = self.cursor.fetchone()
-        stats['min_price'] = min_price or 0
-        stats['max_price'] = max_price or 0
-        
-        return stats
+        return {
+            'total_products': total_products,
+            'total_categories': total_categories,
+            'avg_price': avg_price or 0,
+            'min_price': min_price or 0,
+            'max_price': max_price or 0,
+        }
     
     def backup_database(self, backup_path: str = None):
         """备份数据库"""
@@ -241,16 +404,22 @@ class ProductDatabase:
         
         try:
             backup_conn = sqlite3.connect(backup_path)
-            self.conn.backup(backup_conn)
+            # 分批复制页面，批次间让出锁，避免长时间阻塞其他连接的写入
+            self.conn.backup(backup_conn, pages=1000, sleep=0.05)
             backup_conn.close()
             print(f"数据库已备份到: {backup_path}")
         except Exception as e:
             print(f"备份失败: {e}")
     
     def close(self):
-        """关闭数据库连接"""
-        if self.conn:
-            self.conn.close()
+        """关闭所有线程的数据库连接"""
+        with self._lock:
+            connections = list(self._connections)
+            self._connections.clear()
+        
+        for conn in connections:
+            conn.close()
+        if connections:
             print("数据库连接已关闭")
     
     def __enter__(self):
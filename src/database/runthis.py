@@ -53,9 +53,19 @@ class run_db:
     def close(self):
         self.db.close()
         
-    def web(self, port = 5050):
-        app.run(debug=True, port = port)
+    def web(self, port = 5050, debug = False):
         print(f"访问 http://localhost:{port} 使用数据库Web界面")
+        if not debug:
+            try:
+                # waitress为可选依赖：多线程的生产级WSGI服务器
+                from waitress import serve
+            except ImportError:
+                pass
+            else:
+                serve(app, host="127.0.0.1", port=port, threads=8)
+                return
+        # 调试模式或未安装waitress时使用Flask自带服务器（多线程）
+        app.run(debug=debug, port=port, threaded=True)
 
 
 
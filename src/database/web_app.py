@@ -3,6 +3,7 @@ import pandas as pd
 import plotly.express as px
 import plotly.io as pio
 import io
+import csv
 from database import ProductDatabase
 
 app = Flask(__name__)
@@ -10,6 +11,9 @@ app = Flask(__name__)
 # 全局数据库管理器
 db = ProductDatabase("products.db")
 
+# 图表结果缓存，数据版本未变化时直接复用
+_chart_cache = {'version': None, 'result': None}
+
 @app.route('/')
 def index():
     """主页面"""
@@ -81,12 +85,14 @@ def export_data():
         return jsonify(db.search_products(limit=10000))
     
     elif format_type == 'csv':
-        products = db.search_products(limit=10000)
-        df = pd.DataFrame(products)
-        
+        # 直接用csv模块写出游标结果，不构造DataFrame
+        cursor = db.conn.execute(
+            "SELECT * FROM products ORDER BY created_at DESC LIMIT ?", (10000,)
+        )
         output = io.StringIO()
-        df.to_csv(output, index=False)
-        output.seek(0)
+        writer = csv.writer(output, lineterminator='\n')
+        writer.writerow([desc[0] for desc in cursor.description])
+        writer.writerows(cursor)
         
         return send_file(
             io.BytesIO(output.getvalue().encode('utf-8')),
@@ -117,28 +123,37 @@ def get_stats():
     """获取统计信息API"""
     return jsonify(db.get_statistics())
 
-@app.route('/api/chart')
-def get_chart():
-    """生成图表API"""
-    products = db.search_products(limit=1000)
-    df = pd.DataFrame(products)
+def _build_charts():
+    """用SQL聚合最近1000个商品的数据并生成图表，返回 (响应数据, 状态码)"""
+    # 按分类统计商品数量（数据库中GROUP BY完成）
+    category_counts = db.get_category_counts(limit=1000)
     
-    if len(df) > 0:
-        # 按分类统计商品数量
-        category_counts = df['category'].value_counts().reset_index()
-        category_counts.columns = ['category', 'count']
-        
-        fig = px.bar(category_counts, x='category', y='count', title='商品分类分布')
+    if category_counts:
+        categories, counts = zip(*category_counts)
+        fig = px.bar(x=list(categories), y=list(counts), title='商品分类分布',
+                     labels={'x': 'category', 'y': 'count'})
         
         # 价格分布直方图
-        fig2 = px.histogram(df, x='price', title='价格分布', nbins=20)
+        fig2 = px.histogram(x=db.get_recent_prices(limit=1000), title='价格分布', nbins=20,
+                            labels={'x': 'price'})
         
-        return jsonify({
+        return {
             'category_chart': pio.to_json(fig),
             'price_chart': pio.to_json(fig2)
-        })
+        }, 200
+    
+    return {'error': '没有足够的数据生成图表'}, 400
+
+@app.route('/api/chart')
+def get_chart():
+    """生成图表API"""
+    version = db.get_data_version()
+    if _chart_cache['version'] != version:
+        _chart_cache['result'] = _build_charts()
+        _chart_cache['version'] = version
     
-    return jsonify({'error': '没有足够的数据生成图表'}), 400
+    data, status = _chart_cache['result']
+    return jsonify(data), status
 
 if __name__ == '__main__':
     app.run(debug=True, port=5050)
\ No newline at end of file
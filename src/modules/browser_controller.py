@@ -11,13 +11,45 @@ import os
 
 from typing import Optional, Tuple, List, Any, Dict
 from pathlib import Path
-from munch import Munch
+from dataclasses import dataclass
 
 from src.config.manager import get_config
 from src.modules.human_simulator import HumanSimulator
 
 logger = logging.getLogger(__name__)
 
+@dataclass(slots=True, frozen=True)
+class BrowserSettings:
+    """浏览器控制器使用的配置项，初始化时从配置字典中一次性取出"""
+    window_width: int
+    window_height: int
+    chrome_path: Optional[str] = None
+    user_data_dir: Optional[str] = None
+    disable_images: bool = False
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'BrowserSettings':
+        """
+        从配置字典中提取浏览器设置
+        
+        Args:
+            config: 完整配置字典
+            
+        Returns:
+            BrowserSettings: 浏览器设置
+        """
+        browser = config['browser']
+        physical = browser['physical']
+        path_config = browser.get('path') or {}
+        network = browser.get('network') or {}
+        return cls(
+            window_width=physical['window_width'],
+            window_height=physical['window_height'],
+            chrome_path=path_config.get('chrome_path'),
+            user_data_dir=path_config.get('user_data_dir'),
+            disable_images=bool(network.get('disable_images', False)),
+        )
+
 class BrowserController:
     """浏览器控制器"""
     
@@ -27,17 +59,20 @@ class BrowserController:
         
         Args:
             simulator: 人类行为模拟器
+            config: 配置字典
         """
-        self.config = Munch.fromDict(config)
+        self.settings = BrowserSettings.from_config(config)
         self.simulator = simulator
-
         
-        self.window_width = self.config.browser.physical.window_width
-        self.window_height = self.config.browser.physical.window_height
+        self.window_width = self.settings.window_width
+        self.window_height = self.settings.window_height
         
         # 浏览器进程
         self.browser_process = None
         
+        # Chrome启动参数，首次打开浏览器时根据配置生成，之后复用
+        self._chrome_args: Optional[List[str]] = None
+        
         logger.info("浏览器控制器初始化完成")
     
     def open_browser(self) -> bool:
@@ -50,26 +85,11 @@ class BrowserController:
         try:
             logger.info("正在打开浏览器...")
             
-            # 检查Chrome路径
-            chrome_path = self.config.browser.path.chrome_path
-            
-            # 构建启动参数
-            chrome_args = [
-                chrome_path if chrome_path else "chrome",
-                f"--window-size={self.window_width},{self.window_height}",
-                "--start-maximized",
-                "--disable-infobars",
-                "--disable-notifications",
-            ]
-            
-            if self.config.browser.network.disable_images:
-                chrome_args.append("--blink-settings=imagesEnabled=false")
-            
-            if self.config.browser.path.user_data_dir:
-                chrome_args.append(f"--user-data-dir={self.config.browser.path.user_data_dir}")
+            if self._chrome_args is None:
+                self._chrome_args = self._build_chrome_args()
             
             # 启动浏览器
-            self.browser_process = subprocess.Popen(chrome_args)
+            self.browser_process = subprocess.Popen(self._chrome_args)
             
             # 等待浏览器启动
             self.simulator.idle_behavior(min_duration=3, max_duration=5)
@@ -81,6 +101,32 @@ class BrowserController:
             logger.error(f"打开浏览器失败: {e}")
             return False
     
+    def _build_chrome_args(self) -> List[str]:
+        """
+        根据配置构建Chrome启动参数
+        
+        Returns:
+            List[str]: 启动命令及参数
+        """
+        settings = self.settings
+        
+        # 构建启动参数
+        chrome_args = [
+            settings.chrome_path if settings.chrome_path else "chrome",
+            f"--window-size={self.window_width},{self.window_height}",
+            "--start-maximized",
+            "--disable-infobars",
+            "--disable-notifications",
+        ]
+        
+        if settings.disable_images:
+            chrome_args.append("--blink-settings=imagesEnabled=false")
+        
+        if settings.user_data_dir:
+            chrome_args.append(f"--user-data-dir={settings.user_data_dir}")
+        
+        return chrome_args
+    
     def navigate_to_url(self, url: str) -> bool:
         """
         导航到指定URL
@@ -94,27 +140,14 @@ class BrowserController:
         try:
             logger.info(f"正在导航到: {url}")
             
-            # 模拟人类行为：按Ctrl+L聚焦地址栏
-            self.simulator.hotkey_human('ctrl', 'l')
-            
-            # 等待地址栏聚焦
-            self.simulator.idle_behavior(min_duration=0.5, max_duration=1.0)
-            
-            # 清除当前URL（如果有）
-            self.simulator.press_key_human('a', presses=1)  # 全选
-            self.simulator.press_key_human('delete', presses=1)
-            
-            # 输入URL
-            self.simulator.type_human(
+            # 模拟人类行为：聚焦地址栏、清空、输入URL并回车
+            self.simulator.type_into_address_bar(
                 url,
                 min_delay=0.05,
                 max_delay=0.2,
                 error_probability=0.01
             )
             
-            # 按回车键
-            self.simulator.press_key_human('enter')
-            
             # 等待页面加载
             self.simulator.idle_behavior(min_duration=3, max_duration=7)
             
@@ -8,15 +8,74 @@ import random
 import time
 import math
 import numpy as np
-from typing import Tuple, List, Optional, Union
+from collections import deque
+from typing import Dict, Tuple, List, Optional, Union
 from dataclasses import dataclass
 from enum import Enum
 import logging
+import functools
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 键盘布局（简化版）
+_KEYBOARD_ROWS = (
+    ('`', '1', '2', '3', '4', '5', '6', '7', '8', '9', '0', '-', '='),
+    ('q', 'w', 'e', 'r', 't', 'y', 'u', 'i', 'o', 'p', '[', ']', '\\'),
+    ('a', 's', 'd', 'f', 'g', 'h', 'j', 'k', 'l', ';', "'"),
+    ('z', 'x', 'c', 'v', 'b', 'n', 'm', ',', '.', '/'),
+)
+
+# 相邻键查找表：字符 -> (左侧键, 右侧键)，行首/行尾一侧为None
+_ADJACENT_KEYS: Dict[str, Tuple[Optional[str], Optional[str]]] = {
+    key: (row[i - 1] if i > 0 else None, row[i + 1] if i + 1 < len(row) else None)
+    for row in _KEYBOARD_ROWS
+    for i, key in enumerate(row)
+}
+
+@functools.lru_cache(maxsize=1)
+def _screen_size() -> Tuple[int, int]:
+    """获取屏幕尺寸，只查询一次显示服务器"""
+    width, height = pyautogui.size()
+    return width, height
+
+def _precise_sleep(duration: float) -> None:
+    """
+    精确等待指定时间
+    
+    time.sleep在Windows上的精度约为1-15毫秒，逐点移动鼠标的毫秒级间隔会被明显拉长；
+    这里先用sleep等待到结束前约2毫秒，剩余部分用perf_counter自旋
+    """
+    if duration <= 0:
+        return
+    end = time.perf_counter() + duration
+    if duration > 0.003:
+        time.sleep(duration - 0.002)
+    while time.perf_counter() < end:
+        pass
+
+# 短于该距离（像素）的移动直接走直线，不生成贝塞尔曲线
+_SHORT_MOVE_DISTANCE = 30
+
+# 每个延迟区间一次预生成的截断正态样本数
+_DELAY_BUFFER_SIZE = 1024
+
+@functools.lru_cache(maxsize=16)
+def _bernstein_matrix(degree: int, num_points: int) -> np.ndarray:
+    """
+    获取贝塞尔曲线的Bernstein基矩阵
+    
+    A[i, j] = C(n, j) * (1 - t_i)^(n - j) * t_i^j，t_i 在[0, 1]上均匀取 num_points 个值，
+    曲线上的点即为 A @ P（P为控制点矩阵）；结果按 (degree, num_points) 缓存，只读
+    """
+    t = np.linspace(0.0, 1.0, num_points)[:, None]
+    j = np.arange(degree + 1)
+    coeffs = np.array([math.comb(degree, k) for k in range(degree + 1)], dtype=np.float64)
+    matrix = coeffs * (1 - t) ** (degree - j) * t ** j
+    matrix.flags.writeable = False
+    return matrix
+
 class MouseButton(Enum):
     """鼠标按钮枚举"""
     LEFT = "left"
@@ -28,7 +87,7 @@ class ScrollDirection(Enum):
     UP = "up"
     DOWN = "down"
 
-@dataclass
+@dataclass(slots=True)
 class HumanDelayConfig:
     """人类延迟配置"""
     min_delay: float = 0.1
@@ -38,7 +97,7 @@ class HumanDelayConfig:
     reaction_time_min: float = 0.1
     reaction_time_max: float = 0.3
 
-@dataclass
+@dataclass(slots=True)
 class MouseMoveConfig:
     """鼠标移动配置"""
     speed_min: float = 0.3  # 最小速度（秒）
@@ -66,11 +125,12 @@ class HumanSimulator:
             human_delay: 人类延迟配置
             mouse_config: 鼠标移动配置
         """
-        # 获取屏幕尺寸
-        self.screen_width, self.screen_height = pyautogui.size()
+        # 获取屏幕尺寸，未指定时才查询
         if screen_width and screen_height:
             self.screen_width = screen_width
             self.screen_height = screen_height
+        else:
+            self.screen_width, self.screen_height = _screen_size()
             
         # 配置
         self.human_delay = human_delay or HumanDelayConfig()
@@ -82,9 +142,14 @@ class HumanSimulator:
         
         # 状态跟踪
         self.last_action_time = time.time()
-        self.mouse_history = []  # 鼠标位置历史，用于行为分析
+        self.mouse_history = deque(maxlen=100)  # 鼠标位置历史（最近100次），用于行为分析
         self.action_counter = 0  # 动作计数器
         
+        # 批量随机数统一使用该生成器；单个标量仍用标准库random
+        self._rng = np.random.default_rng()
+        # 随机延迟样本缓冲：(min_val, max_val) -> 预生成的延迟列表
+        self._delay_buffers: Dict[Tuple[float, float], List[float]] = {}
+        
         logger.info(f"HumanSimulator初始化完成，屏幕尺寸: {self.screen_width}x{self.screen_height}")
     
     def _get_random_delay(self, 
@@ -105,14 +170,21 @@ class HumanSimulator:
         if max_val is None:
             max_val = self.human_delay.max_delay
             
-        # 使用截断正态分布，更接近人类行为
-        mean = (min_val + max_val) / 2
-        std = (max_val - min_val) / 6  # 99.7%的值在[min_val, max_val]内
-        
-        delay = np.random.normal(mean, std)
-        delay = max(min_val, min(max_val, delay))  # 截断到[min_val, max_val]
+        # 同一区间的样本一次批量生成，之后逐个取出
+        key = (min_val, max_val)
+        buffer = self._delay_buffers.get(key)
+        if not buffer:
+            # 使用截断正态分布，更接近人类行为
+            mean = (min_val + max_val) / 2
+            std = (max_val - min_val) / 6  # 99.7%的值在[min_val, max_val]内
+            
+            # 截断到[min_val, max_val]
+            buffer = np.clip(
+                self._rng.normal(mean, std, _DELAY_BUFFER_SIZE), min_val, max_val
+            ).tolist()
+            self._delay_buffers[key] = buffer
         
-        return delay
+        return buffer.pop()
     
     def _human_delay(self, 
                     min_val: Optional[float] = None,
@@ -134,7 +206,7 @@ class HumanSimulator:
             max_val = max_val or self.human_delay.reaction_time_max
         
         delay = self._get_random_delay(min_val, max_val)
-        logger.debug(f"执行{purpose}延迟: {delay:.2f}秒")
+        logger.debug("执行%s延迟: %.2f秒", purpose, delay)
         time.sleep(delay)
         
         # 更新最后动作时间
@@ -143,7 +215,7 @@ class HumanSimulator:
     def _generate_bezier_curve(self, 
                               start: Tuple[int, int], 
                               end: Tuple[int, int], 
-                              control_points: int = 3) -> List[Tuple[int, int]]:
+                              control_points: int = 3) -> np.ndarray:
         """
         生成贝塞尔曲线路径
         
@@ -153,61 +225,69 @@ class HumanSimulator:
             control_points: 控制点数量
             
         Returns:
-            List[Tuple[int, int]]: 曲线路径点
-        """
-        # 生成控制点
-        ctrl_pts = []
-        for i in range(control_points):
-            # 在起点和终点之间生成控制点
-            t = (i + 1) / (control_points + 1)
-            # 添加随机偏移
-            offset_x = random.randint(-50, 50)
-            offset_y = random.randint(-50, 50)
-            x = int(start[0] + (end[0] - start[0]) * t + offset_x)
-            y = int(start[1] + (end[1] - start[1]) * t + offset_y)
-            ctrl_pts.append((x, y))
-        
-        # 生成贝塞尔曲线点
-        curve_points = []
-        num_points = 50  # 曲线上的点数
+            np.ndarray: 曲线路径点，形状为(N, 2)的整数数组
+        """
+        start_pt = np.array(start, dtype=np.float64)
+        end_pt = np.array(end, dtype=np.float64)
         
-        for i in range(num_points):
-            t = i / (num_points - 1)
-            
-            # 多重贝塞尔曲线插值
-            points = [start] + ctrl_pts + [end]
-            while len(points) > 1:
-                new_points = []
-                for j in range(len(points) - 1):
-                    x = (1 - t) * points[j][0] + t * points[j + 1][0]
-                    y = (1 - t) * points[j][1] + t * points[j + 1][1]
-                    new_points.append((x, y))
-                points = new_points
-            
-            curve_points.append((int(points[0][0]), int(points[0][1])))
+        # 在起点和终点之间均匀生成控制点，并添加随机偏移（取整到像素）
+        t = np.arange(1, control_points + 1)[:, None] / (control_points + 1)
+        offsets = self._rng.integers(-50, 51, size=(control_points, 2))
+        ctrl_pts = np.trunc(start_pt + (end_pt - start_pt) * t + offsets)
+        
+        # 生成贝塞尔曲线点：Bernstein基矩阵与控制点矩阵相乘，一次得到所有点
+        num_points = 50  # 曲线上的点数
+        points = np.vstack((start_pt, ctrl_pts, end_pt))
+        curve = _bernstein_matrix(len(points) - 1, num_points) @ points
         
-        return curve_points
+        return curve.astype(int)
     
     def _add_jitter_to_path(self, 
-                           path: List[Tuple[int, int]], 
-                           jitter_factor: float) -> List[Tuple[int, int]]:
+                           path: np.ndarray, 
+                           jitter_factor: float) -> np.ndarray:
         """
         向路径添加微小抖动，模拟人类手部颤抖
         
         Args:
-            path: 原始路径
+            path: 原始路径，形状为(N, 2)的整数数组
             jitter_factor: 抖动因子
             
         Returns:
-            List[Tuple[int, int]]: 添加抖动后的路径
+            np.ndarray: 添加抖动后的路径
         """
-        jittered_path = []
-        for x, y in path:
-            jitter_x = random.randint(-int(jitter_factor * 10), int(jitter_factor * 10))
-            jitter_y = random.randint(-int(jitter_factor * 10), int(jitter_factor * 10))
-            jittered_path.append((x + jitter_x, y + jitter_y))
+        radius = int(jitter_factor * 10)
+        return path + self._rng.integers(-radius, radius + 1, size=path.shape)
+    
+    def _follow_path(self, path: np.ndarray, duration: float) -> None:
+        """
+        沿路径移动鼠标，总耗时约为duration
+        
+        相邻的重复点只移动一次；每步间隔预先生成并按绝对时刻调度，
+        moveTo本身的耗时不会累积到总时长中
+        
+        Args:
+            path: 路径点，形状为(N, 2)的整数数组
+            duration: 总移动时间（秒）
+        """
+        if len(path) > 1:
+            # 去掉与前一点相同的点（取整和抖动后常见）
+            keep = np.ones(len(path), dtype=bool)
+            keep[1:] = (path[1:] != path[:-1]).any(axis=1)
+            path = path[keep]
+        
+        points = path.tolist()
+        if not points:
+            return
         
-        return jittered_path
+        # 非匀速移动，模拟人类行为：每步间隔在平均值上随机浮动±20%
+        interval = duration / len(points)
+        deadlines = (np.cumsum(self._rng.uniform(0.8, 1.2, len(points) - 1)) * interval).tolist()
+        
+        start_time = time.perf_counter()
+        pyautogui.moveTo(*points[0])
+        for (x, y), deadline in zip(points[1:], deadlines):
+            _precise_sleep(start_time + deadline - time.perf_counter())
+            pyautogui.moveTo(x, y)
     
     def move_mouse_human(self, 
                         target_x: int, 
@@ -237,9 +317,11 @@ class HumanSimulator:
         # 生成移动路径
         start_pos = (current_x, current_y)
         end_pos = (target_x, target_y)
+        distance = math.hypot(target_x - current_x, target_y - current_y)
         
-        # 随机决定是否使用曲线路径（70%概率使用曲线）
-        use_curve = random.random() < 0.7
+        # 随机决定是否使用曲线路径（70%概率使用曲线）；短距离移动始终使用直线，
+        # 控制点±50像素的偏移在短距离上只会造成明显绕路
+        use_curve = distance >= _SHORT_MOVE_DISTANCE and random.random() < 0.7
         
         if use_curve:
             curve_factor = curve_factor or self.mouse_config.curve_factor
@@ -249,45 +331,29 @@ class HumanSimulator:
             path = self._add_jitter_to_path(path, self.mouse_config.jitter_factor)
         else:
             # 直线路径，但也添加一些点来模拟不均匀速度
-            distance = math.sqrt((target_x - current_x)**2 + (target_y - current_y)**2)
             num_points = max(5, int(distance / 10))
-            path = []
             
-            for i in range(num_points + 1):
-                t = i / num_points
-                # 使用缓动函数使移动更自然
-                t_eased = t * t * (3 - 2 * t)  # 平滑的缓动函数
-                x = int(current_x + (target_x - current_x) * t_eased)
-                y = int(current_y + (target_y - current_y) * t_eased)
-                path.append((x, y))
+            t = np.linspace(0.0, 1.0, num_points + 1)
+            # 使用缓动函数使移动更自然
+            t_eased = t * t * (3 - 2 * t)  # 平滑的缓动函数
+            xs = current_x + t_eased * (target_x - current_x)
+            ys = current_y + t_eased * (target_y - current_y)
+            path = np.column_stack((xs, ys)).astype(int)
         
         # 确定移动速度
         if speed is None:
             speed = random.uniform(self.mouse_config.speed_min, self.mouse_config.speed_max)
         
-        # 计算每点之间的时间间隔
-        total_time = speed
-        interval = total_time / len(path) if path else total_time
-        
         # 执行移动
-        for i, (x, y) in enumerate(path):
-            pyautogui.moveTo(x, y)
-            
-            # 非匀速移动，模拟人类行为
-            if i < len(path) - 1:
-                # 使用随机间隔，但确保总时间大致正确
-                actual_interval = interval * random.uniform(0.8, 1.2)
-                time.sleep(actual_interval)
+        self._follow_path(path, speed)
         
         # 记录鼠标位置
         self.mouse_history.append((target_x, target_y, time.time()))
-        if len(self.mouse_history) > 100:
-            self.mouse_history.pop(0)
         
         # 增加动作计数
         self.action_counter += 1
         
-        logger.debug(f"鼠标移动到 ({target_x}, {target_y})，使用{'曲线' if use_curve else '直线'}路径")
+        logger.debug("鼠标移动到 (%s, %s)，使用%s路径", target_x, target_y, '曲线' if use_curve else '直线')
     
     def click_human(self, 
                    x: Optional[int] = None, 
@@ -322,19 +388,20 @@ class HumanSimulator:
         self._human_delay(min_val=0.05, max_val=0.2, purpose="reaction")
         
         # 执行点击
+        button_name = button.value
         if double_click:
             # 双击，中间有微小间隔
-            pyautogui.click(button=button.value)
+            pyautogui.click(button=button_name)
             time.sleep(random.uniform(0.1, 0.3))
-            pyautogui.click(button=button.value)
+            pyautogui.click(button=button_name)
         else:
             # 单机
-            pyautogui.click(button=button.value)
+            pyautogui.click(button=button_name)
         
         # 点击后的微小停顿
         self._human_delay(min_val=0.1, max_val=0.3, purpose="thinking")
         
-        logger.debug(f"在位置 ({x}, {y}) 执行{button.value}{'双击' if double_click else '单击'}")
+        logger.debug("在位置 (%s, %s) 执行%s%s", x, y, button_name, '双击' if double_click else '单击')
     
     def type_human(self, 
                   text: str,
@@ -352,18 +419,21 @@ class HumanSimulator:
             error_probability: 输错概率
             error_correction_probability: 纠错概率（如果输错）
         """
-        logger.debug(f"开始输入文本: '{text[:20]}...' 共{len(text)}字符")
+        logger.debug("开始输入文本: '%s...' 共%d字符", text[:20], len(text))
+        
+        # 预先批量决定哪些字符模拟输入错误、哪些字符后停顿思考
+        n = len(text)
+        errors = (self._rng.random(n) < error_probability).tolist()
+        pauses = (self._rng.random(n) < 0.05).tolist()  # 5%的概率
         
-        for i, char in enumerate(text):
-            # 决定是否模拟输入错误
-            make_error = random.random() < error_probability
+        for i, (char, make_error, pause) in enumerate(zip(text, errors, pauses)):
             error_char = None
             
             if make_error:
                 # 选择附近的键作为错误输入
                 error_char = self._get_adjacent_key(char)
                 if error_char:
-                    logger.debug(f"模拟输入错误: '{char}' -> '{error_char}'")
+                    logger.debug("模拟输入错误: '%s' -> '%s'", char, error_char)
                     pyautogui.press(error_char)
                     
                     # 决定是否纠正错误
@@ -379,19 +449,70 @@ class HumanSimulator:
                 # 已经纠正了错误，现在输入正确字符
                 pyautogui.press(char)
             
-            # 字符间延迟（使用正态分布）
+            # 字符间延迟（截断正态分布，取自预生成的样本缓冲）
             if i < len(text) - 1:  # 最后一个字符后不需要延迟
-                delay = np.random.normal(
-                    (min_delay + max_delay) / 2,
-                    (max_delay - min_delay) / 6
-                )
-                delay = max(min_delay, min(max_delay, delay))
-                time.sleep(delay)
+                _precise_sleep(self._get_random_delay(min_delay, max_delay))
             
             # 偶尔添加额外延迟，模拟思考
-            if random.random() < 0.05:  # 5%的概率
+            if pause:
                 time.sleep(random.uniform(0.2, 0.8))
     
+    def type_into_address_bar(self,
+                              url: str,
+                              min_delay: float = 0.05,
+                              max_delay: float = 0.2,
+                              error_probability: float = 0.01) -> None:
+        """
+        聚焦浏览器地址栏，清空后输入URL并回车
+        
+        整个过程的延迟在开始前一次性生成，输入时不再逐键调用随机数；
+        与type_human不同，输错的字符总会被纠正，保证URL完整。
+        
+        Args:
+            url: 目标URL
+            min_delay: 字符间最小延迟
+            max_delay: 字符间最大延迟
+            error_probability: 输错概率
+        """
+        n = len(url)
+        
+        # 字符间延迟（截断正态分布），5%的字符后附加思考停顿
+        delays = np.clip(
+            self._rng.normal((min_delay + max_delay) / 2, (max_delay - min_delay) / 6, size=n),
+            min_delay, max_delay
+        )
+        delays += np.where(self._rng.random(n) < 0.05, self._rng.uniform(0.2, 0.8, size=n), 0.0)
+        delays = delays.tolist()
+        errors = (self._rng.random(n) < error_probability).tolist()
+        
+        # 等待地址栏聚焦、清空后停顿、输错后反应、退格后停顿
+        focus_wait, clear_wait, error_wait, backspace_wait = self._rng.uniform(
+            (0.5, 0.1, 0.1, 0.1), (1.0, 0.3, 0.5, 0.3)
+        ).tolist()
+        
+        # Ctrl+L聚焦地址栏，Ctrl+A全选后删除当前URL
+        self.hotkey_human('ctrl', 'l')
+        time.sleep(focus_wait)
+        self.hotkey_human('ctrl', 'a')
+        pyautogui.press('delete')
+        time.sleep(clear_wait)
+        
+        for char, delay, make_error in zip(url, delays, errors):
+            if make_error:
+                error_char = self._get_adjacent_key(char)
+                if error_char:
+                    logger.debug("模拟输入错误: '%s' -> '%s'", char, error_char)
+                    pyautogui.press(error_char)
+                    time.sleep(error_wait)
+                    pyautogui.press('backspace')
+                    time.sleep(backspace_wait)
+            
+            pyautogui.press(char)
+            _precise_sleep(delay)
+        
+        pyautogui.press('enter')
+        logger.debug("地址栏输入完成: %s", url)
+    
     def _get_adjacent_key(self, char: str) -> Optional[str]:
         """
         获取相邻键（用于模拟输入错误）
@@ -402,27 +523,12 @@ class HumanSimulator:
         Returns:
             Optional[str]: 相邻键字符，None表示没有找到
         """
-        # 键盘布局（简化版）
-        keyboard_layout = {
-            'row1': ['`', '1', '2', '3', '4', '5', '6', '7', '8', '9', '0', '-', '='],
-            'row2': ['q', 'w', 'e', 'r', 't', 'y', 'u', 'i', 'o', 'p', '[', ']', '\\'],
-            'row3': ['a', 's', 'd', 'f', 'g', 'h', 'j', 'k', 'l', ';', "'"],
-            'row4': ['z', 'x', 'c', 'v', 'b', 'n', 'm', ',', '.', '/']
-        }
-        
-        char_lower = char.lower()
+        neighbors = _ADJACENT_KEYS.get(char.lower())
+        if neighbors is None:
+            return None
         
-        # 查找字符所在位置
-        for row, keys in keyboard_layout.items():
-            if char_lower in keys:
-                idx = keys.index(char_lower)
-                # 随机选择相邻键
-                offset = random.choice([-1, 1])
-                new_idx = idx + offset
-                if 0 <= new_idx < len(keys):
-                    return keys[new_idx]
-        
-        return None
+        # 随机选择左侧或右侧相邻键，行首/行尾越界时返回None
+        return random.choice(neighbors)
     
     def scroll_human(self, 
                     direction: ScrollDirection = ScrollDirection.DOWN,
@@ -442,18 +548,20 @@ class HumanSimulator:
         if x is not None and y is not None:
             self.move_mouse_human(x, y)
         
+        # 滚动幅度范围：向下为负，向上为正
+        low, high = (-3, -1) if direction is ScrollDirection.DOWN else (1, 3)
+        
         # 执行滚动
         for i in range(clicks):
             # 随机决定滚动幅度
-            scroll_amount = random.randint(-3, -1) if direction == ScrollDirection.DOWN else random.randint(1, 3)
-            pyautogui.scroll(scroll_amount)
+            pyautogui.scroll(random.randint(low, high))
             
             # 滚动之间的延迟
             if i < clicks - 1:
                 delay = random.uniform(0.2, 0.8)
                 time.sleep(delay)
         
-        logger.debug(f"执行{clicks}次{direction.value}滚动")
+        logger.debug("执行%d次%s滚动", clicks, direction.value)
     
     def drag_human(self, 
                   start_x: int, 
@@ -484,17 +592,13 @@ class HumanSimulator:
         
         # 使用曲线路径拖拽
         path = self._generate_bezier_curve((start_x, start_y), (end_x, end_y))
-        
-        interval = duration / len(path) if path else duration
-        for x, y in path:
-            pyautogui.moveTo(x, y)
-            time.sleep(interval * random.uniform(0.8, 1.2))
+        self._follow_path(path, duration)
         
         # 释放鼠标
         time.sleep(random.uniform(0.1, 0.3))
         pyautogui.mouseUp()
         
-        logger.debug(f"从 ({start_x}, {start_y}) 拖拽到 ({end_x}, {end_y})")
+        logger.debug("从 (%s, %s) 拖拽到 (%s, %s)", start_x, start_y, end_x, end_y)
     
     def press_key_human(self, 
                        key: str,
@@ -517,7 +621,7 @@ class HumanSimulator:
                     interval = random.uniform(0.1, 0.5)
                 time.sleep(interval)
         
-        logger.debug(f"按下键: {key} {presses}次")
+        logger.debug("按下键: %s %d次", key, presses)
     
     def hotkey_human(self, *keys: str) -> None:
         """
@@ -540,7 +644,7 @@ class HumanSimulator:
             pyautogui.keyUp(key)
             time.sleep(random.uniform(0.05, 0.15))
         
-        logger.debug(f"执行快捷键: {'+'.join(keys)}")
+        logger.debug("执行快捷键: %s", '+'.join(keys))
     
     def idle_behavior(self, 
                      min_duration: float = 2.0,
@@ -553,7 +657,7 @@ class HumanSimulator:
             max_duration: 最大空闲时间
         """
         duration = random.uniform(min_duration, max_duration)
-        logger.debug(f"开始空闲行为，持续{duration:.1f}秒")
+        logger.debug("开始空闲行为，持续%.1f秒", duration)
         
         start_time = time.time()
         while time.time() - start_time < duration:
@@ -607,17 +711,14 @@ class HumanSimulator:
         if len(self.mouse_history) < 2:
             return {}
         
-        # 计算移动速度模式
-        speeds = []
-        for i in range(1, len(self.mouse_history)):
-            x1, y1, t1 = self.mouse_history[i-1]
-            x2, y2, t2 = self.mouse_history[i]
-            distance = math.sqrt((x2-x1)**2 + (y2-y1)**2)
-            time_diff = t2 - t1
-            if time_diff > 0:
-                speeds.append(distance / time_diff)
-        
-        avg_speed = sum(speeds) / len(speeds) if speeds else 0
+        # 计算移动速度模式：相邻记录间的距离和时间差一次向量计算
+        history = np.array(self.mouse_history, dtype=np.float64)
+        deltas = np.diff(history, axis=0)
+        distances = np.hypot(deltas[:, 0], deltas[:, 1])
+        time_diffs = deltas[:, 2]
+        valid = time_diffs > 0
+        
+        avg_speed = float(np.mean(distances[valid] / time_diffs[valid])) if valid.any() else 0
         
         return {
             'total_actions': self.action_counter,
@@ -25,7 +25,7 @@ hs = HumanSimulator(
 bc = BrowserController(simulator=hs, config=config)
 
 chrome_args = [
-    bc.config.browser.path.chrome_path,
+    bc.settings.chrome_path,
     "--start-maximized",
     "--disable-infobars",
     "--disable-notifications",
@@ -0,0 +1,63 @@
+"""
+test_database.py
+商品数据库测试
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+from src.database.database import ProductDatabase
+
+
+class ExportToJsonTest(unittest.TestCase):
+    """export_to_json 的输出应与 json.dump(商品列表, ensure_ascii=False, indent=2) 完全一致"""
+
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.db = ProductDatabase(os.path.join(self._tmpdir.name, 'products.db'))
+
+    def tearDown(self):
+        self.db.close()
+        self._tmpdir.cleanup()
+
+    def _assert_matches_json_dump(self):
+        export_path = os.path.join(self._tmpdir.name, 'export.json')
+        expected_path = os.path.join(self._tmpdir.name, 'expected.json')
+
+        self.db.export_to_json(export_path)
+        with open(expected_path, 'w', encoding='utf-8') as f:
+            json.dump(self.db.search_products(limit=10000), f, ensure_ascii=False, indent=2)
+
+        with open(export_path, 'rb') as exported, open(expected_path, 'rb') as expected:
+            self.assertEqual(exported.read(), expected.read())
+
+    def test_exponent_prices_match_stdlib_format(self):
+        self.db.insert_from_json([
+            {'name': 'Big', 'category': 'test', 'price': 1e16, 'source_url': 'https://example.com/big'},
+            {'name': 'Tiny', 'category': 'test', 'price': 1e-5, 'source_url': 'https://example.com/tiny'},
+        ])
+        self._assert_matches_json_dump()
+
+    def test_non_ascii_names_and_exponent_prices(self):
+        self.db.insert_from_json([
+            {'name': '金士顿 DDR4 32G', 'category': '内存条', 'price': 2.5e+20, 'source_url': 'https://example.com/内存'},
+            {'name': 'Café «Ω»', 'category': '笔记本电脑', 'price': 3.25e-07, 'source_url': None},
+            {'name': '普通商品', 'category': '内存条', 'price': '¥1,299.00', 'source_url': ''},
+        ])
+        self._assert_matches_json_dump()
+
+    def test_empty_table(self):
+        self._assert_matches_json_dump()
+
+    def test_rows_spanning_several_fetch_batches(self):
+        self.db.insert_from_json([
+            {'name': f'商品{i}', 'category': f'分类{i % 7}', 'price': i * 1.5e-3, 'source_url': None}
+            for i in range(2500)
+        ])
+        self._assert_matches_json_dump()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+"""
+test_manager.py
+配置管理器测试
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import yaml
+
+from src.config.manager import ConfigManager
+
+TEMPLATE_PATH = Path(__file__).resolve().parent.parent / "src" / "config" / "templates" / "config.yaml.template"
+
+
+class ReloadTest(unittest.TestCase):
+    """reload() 失败时保留上一次有效的配置"""
+
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.config_path = Path(self._tmpdir.name) / "config.yaml"
+        shutil.copy(TEMPLATE_PATH, self.config_path)
+        self.manager = ConfigManager(config_path=self.config_path, template_path=TEMPLATE_PATH)
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def _read_file(self):
+        with open(self.config_path, encoding='utf-8') as f:
+            return yaml.safe_load(f)
+
+    def test_failed_reload_keeps_previous_config(self):
+        old_level = self.manager.get('monitoring.log_level')
+        old_pages = self.manager.get('search.max_pages')
+
+        # 写入一份数据验证不通过的配置（日志级别无效）
+        invalid = self._read_file()
+        invalid['monitoring']['log_level'] = 'NOT_A_LEVEL'
+        invalid['search']['max_pages'] = old_pages + 1
+        with open(self.config_path, 'w', encoding='utf-8') as f:
+            yaml.safe_dump(invalid, f, allow_unicode=True)
+
+        self.assertFalse(self.manager.reload())
+
+        # get() 与只读视图仍然反映之前的有效配置
+        self.assertEqual(self.manager.get('monitoring.log_level'), old_level)
+        self.assertEqual(self.manager.get('search.max_pages'), old_pages)
+        self.assertEqual(self.manager.dict_config['monitoring']['log_level'], old_level)
+        self.assertEqual(self.manager.dict_config['search']['max_pages'], old_pages)
+
+        # 之后修改同一子配置并save()，写回的仍是之前的有效配置，而不是被拒绝的数据
+        self.assertTrue(self.manager.set('search.scroll_pause', 2.0))
+        self.assertEqual(self.manager.get('search.max_pages'), old_pages)
+        self.assertTrue(self.manager.save(backup=False))
+        saved = self._read_file()
+        self.assertEqual(saved['monitoring']['log_level'], old_level)
+        self.assertEqual(saved['search']['max_pages'], old_pages)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+"""
+test_validator.py
+配置验证器测试
+"""
+
+import unittest
+
+from src.config.validator import ConfigValidator
+
+
+class ValidateEmailTest(unittest.TestCase):
+    """validate_email 与原正则 ^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\\.[a-zA-Z]{2,}$ 行为一致"""
+
+    def test_accepts_plain_addresses(self):
+        for email in ('a@b.cd', 'user.name+tag@mail.example.com', 'A_1%x-y@sub-domain.Example.ORG'):
+            with self.subTest(email=email):
+                self.assertTrue(ConfigValidator.validate_email(email))
+
+    def test_rejects_addresses_outside_ascii_charset(self):
+        for email in ('a@b_c.com', '"a"@b.com', 'a!#@b.com', 'a@[1.2.3.4].com',
+                      'a@b.中国', '用户@b.com', 'Bob <a@b.cd>', 'a b@c.de'):
+            with self.subTest(email=email):
+                self.assertFalse(ConfigValidator.validate_email(email))
+
+    def test_rejects_malformed_addresses(self):
+        for email in ('', 'a', '@b.cd', 'a@', 'a@.cd', 'a@b.c', 'a@b.c1', 'a@@b.cd', 'a@b.cd\n', None, 1):
+            with self.subTest(email=email):
+                self.assertFalse(ConfigValidator.validate_email(email))
+
+
+if __name__ == '__main__':
+    unittest.main()